@@ -16,6 +16,7 @@ import json
 import logging
 import re
 import requests
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Union, Tuple
 
@@ -206,31 +207,33 @@ def execute_promql_query(
     Returns:
         Structured query results with metadata
     """
-    # Parse time parameters
+    # Parse time parameters. Unix time comes straight from time.time(): calling
+    # .timestamp() on a naive utcnow() would shift it by the host's UTC offset.
+    now = time.time()
+    default_start = now - timedelta(hours=1).total_seconds()
     if start_time:
         if start_time.endswith(('m', 'h', 'd')):
             # Relative time (e.g., "1h", "30m")
-            now = datetime.utcnow()
             if start_time.endswith('m'):
                 minutes = int(start_time[:-1])
-                start_timestamp = (now - timedelta(minutes=minutes)).timestamp()
+                start_timestamp = now - timedelta(minutes=minutes).total_seconds()
             elif start_time.endswith('h'):
                 hours = int(start_time[:-1])
-                start_timestamp = (now - timedelta(hours=hours)).timestamp()
+                start_timestamp = now - timedelta(hours=hours).total_seconds()
             elif start_time.endswith('d'):
                 days = int(start_time[:-1])
-                start_timestamp = (now - timedelta(days=days)).timestamp()
+                start_timestamp = now - timedelta(days=days).total_seconds()
         else:
             # Absolute time
             start_timestamp = datetime.fromisoformat(start_time.replace('Z', '+00:00')).timestamp()
     else:
         # Default to last 1 hour
-        start_timestamp = (datetime.utcnow() - timedelta(hours=1)).timestamp()
+        start_timestamp = default_start
     
     if end_time:
         end_timestamp = datetime.fromisoformat(end_time.replace('Z', '+00:00')).timestamp()
     else:
-        end_timestamp = datetime.utcnow().timestamp()
+        end_timestamp = now
     
     # Execute query - use instant query if no time range specified
     if start_time or end_time:
@@ -250,8 +253,8 @@ def execute_promql_query(
     # Structure the response
     return {
         "query": query,
-        "start_time": start_time or f"{int((datetime.utcnow() - timedelta(hours=1)).timestamp())}",
-        "end_time": end_time or f"{int(datetime.utcnow().timestamp())}",
+        "start_time": start_time or f"{int(default_start)}",
+        "end_time": end_time or f"{int(now)}",
         "status": response.get("status"),
         "result_type": response.get("data", {}).get("resultType"),
         "results": response.get("data", {}).get("result", []),
@@ -693,41 +696,40 @@ def generate_metadata_driven_promql(
 # Query Generation Helpers
 # =============================================================================
 
+# Example query shapes per metric type, filled in with the metric name
+_QUERY_EXAMPLE_TEMPLATES = {
+    'counter': (
+        "rate({metric}[5m])",
+        "sum(rate({metric}[5m]))",
+        "increase({metric}[1h])",
+    ),
+    'gauge': (
+        "avg({metric})",
+        "max({metric})",
+        "min({metric})",
+    ),
+    'histogram': (
+        "histogram_quantile(0.95, {metric}_bucket)",
+        "histogram_quantile(0.99, {metric}_bucket)",
+        "rate({metric}_sum[5m]) / rate({metric}_count[5m])",
+    ),
+}
+_COMMON_AGGREGATION_TEMPLATES = (
+    "sum by (instance) ({metric})",
+    "avg by (job) ({metric})",
+)
+
+
 def generate_query_examples(metric_name: str, metadata: Dict[str, Any]) -> List[str]:
     """Generate example PromQL queries for a metric based on its metadata."""
-    examples = []
     metric_type = metadata.get('type', '').lower()
+    templates = (
+        ("{metric}",)  # Basic query
+        + _QUERY_EXAMPLE_TEMPLATES.get(metric_type, ())  # Type-specific examples
+        + _COMMON_AGGREGATION_TEMPLATES
+    )
     
-    # Basic query
-    examples.append(metric_name)
-    
-    # Type-specific examples
-    if metric_type == 'counter':
-        examples.extend([
-            f"rate({metric_name}[5m])",
-            f"sum(rate({metric_name}[5m]))",
-            f"increase({metric_name}[1h])"
-        ])
-    elif metric_type == 'gauge':
-        examples.extend([
-            f"avg({metric_name})",
-            f"max({metric_name})",
-            f"min({metric_name})"
-        ])
-    elif metric_type == 'histogram':
-        examples.extend([
-            f"histogram_quantile(0.95, {metric_name}_bucket)",
-            f"histogram_quantile(0.99, {metric_name}_bucket)",
-            f"rate({metric_name}_sum[5m]) / rate({metric_name}_count[5m])"
-        ])
-    
-    # Add common aggregations
-    examples.extend([
-        f"sum by (instance) ({metric_name})",
-        f"avg by (job) ({metric_name})"
-    ])
-    
-    return examples[:6]  # Limit to 6 examples
+    return [template.format(metric=metric_name) for template in templates[:6]]  # Limit to 6 examples
 
 
 def suggest_related_queries(user_intent: str, base_metric: str = "") -> List[str]:
@@ -75,6 +75,7 @@ MAX_PER_SERVICE_LIMIT = 50  # Maximum traces to fetch per service in wildcard qu
 DEFAULT_CHAT_QUERY_LIMIT = 50  # Default limit for chat tool queries
 DEFAULT_QUERY_LIMIT = 20  # Default limit for regular queries
 REQUEST_TIMEOUT_SECONDS = 30.0  # HTTP request timeout
+MAX_CONCURRENT_SERVICE_QUERIES = 8  # Per-service Tempo queries in flight at once for wildcard queries
 
 # Load complex configurations
 MODEL_CONFIG = load_model_config()
@@ -91,4 +92,22 @@ FLEET_WIDE_DISPLAY = "Fleet-wide"
 MAX_TIME_RANGE_DAYS: int = int(os.getenv("MAX_TIME_RANGE_DAYS", "90"))
 
 # Default time range when none is provided (in days)
-DEFAULT_TIME_RANGE_DAYS: int = int(os.getenv("DEFAULT_TIME_RANGE_DAYS", "90"))
\ No newline at end of file
+DEFAULT_TIME_RANGE_DAYS: int = int(os.getenv("DEFAULT_TIME_RANGE_DAYS", "90"))
+
+# LLM summary response cache
+# Identical prompts within the TTL reuse the previous LLM response (0 disables caching)
+LLM_SUMMARY_CACHE_MAXSIZE: int = int(os.getenv("LLM_SUMMARY_CACHE_MAXSIZE", "512"))
+LLM_SUMMARY_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_SUMMARY_CACHE_TTL_SECONDS", "300"))
+
+# Tempo query result cache
+# Identical trace queries (query, time range, limit) within the TTL reuse the previous result (0 disables caching)
+TEMPO_QUERY_CACHE_MAXSIZE: int = int(os.getenv("TEMPO_QUERY_CACHE_MAXSIZE", "128"))
+TEMPO_QUERY_CACHE_TTL_SECONDS: int = int(os.getenv("TEMPO_QUERY_CACHE_TTL_SECONDS", "30"))
+
+# Tempo service discovery cache
+# The service list changes slowly, so wildcard queries reuse it within the TTL (0 disables caching)
+TEMPO_SERVICES_CACHE_TTL_SECONDS: int = int(os.getenv("TEMPO_SERVICES_CACHE_TTL_SECONDS", "60"))
+
+# Service account token cache
+# The in-cluster token file is re-read at most once per TTL so rotated tokens are still picked up (0 disables caching)
+SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS", "300"))
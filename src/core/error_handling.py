@@ -2,7 +2,9 @@
 
 import re
 from enum import Enum
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .regex_utils import compile_ranked, first_ranked_match
 
 
 class ErrorType(Enum):
@@ -17,6 +19,20 @@ class ErrorType(Enum):
     UNKNOWN = "unknown"
 
 
+def _compile_error_patterns(error_patterns: Dict[ErrorType, List[str]]) -> Tuple["re.Pattern[str]", Tuple[ErrorType, ...]]:
+    """
+    Compile an ERROR_PATTERNS mapping into one case-insensitive ranked regex.
+
+    Ranks follow the mapping's insertion order, which is the match priority.
+    """
+    error_types = tuple(error_patterns)
+    ranked_regex = compile_ranked(
+        ["|".join(f"(?:{pattern})" for pattern in error_patterns[error_type]) for error_type in error_types],
+        re.IGNORECASE,
+    )
+    return ranked_regex, error_types
+
+
 class ServiceErrorClassifier:
     """Classifies service-related errors for better error handling and user messaging."""
 
@@ -65,6 +81,9 @@ class ServiceErrorClassifier:
         ]
     }
 
+    # (regex, error types in rank order) built from ERROR_PATTERNS
+    _COMPILED_ERROR_PATTERNS = _compile_error_patterns(ERROR_PATTERNS)
+
     # HTTP status code to error type mapping
     HTTP_STATUS_MAPPING = {
         401: ErrorType.AUTHENTICATION_FAILED,
@@ -74,6 +93,24 @@ class ServiceErrorClassifier:
         504: ErrorType.TIMEOUT,
     }
 
+    # User-facing message templates, formatted with service_name and service_url
+    MESSAGE_TEMPLATES = {
+        ErrorType.CONNECTION_REFUSED: "{service_name} service refused connection at {service_url}. Check if {service_name} is running.",
+        ErrorType.DNS_RESOLUTION_FAILED: "{service_name} service not reachable at {service_url}. This is expected when running locally. Deploy to OpenShift to access {service_name}.",
+        ErrorType.HTTP_ERROR: "HTTP error accessing {service_name} at {service_url}. Check if the service is properly configured.",
+        ErrorType.TIMEOUT: "Request to {service_name} timed out at {service_url}. The service may be overloaded or unreachable.",
+        ErrorType.AUTHENTICATION_FAILED: "Authentication failed when accessing {service_name} at {service_url}. Check your credentials.",
+        ErrorType.SERVICE_UNAVAILABLE: "{service_name} service is temporarily unavailable at {service_url}. Please try again later.",
+        ErrorType.RATE_LIMITED: "Rate limit exceeded for {service_name} at {service_url}. Please wait before making more requests.",
+        ErrorType.UNKNOWN: "Unexpected error accessing {service_name} at {service_url}"
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        # Recompile only for subclasses that override ERROR_PATTERNS
+        super().__init_subclass__(**kwargs)
+        if "ERROR_PATTERNS" in cls.__dict__:
+            cls._COMPILED_ERROR_PATTERNS = _compile_error_patterns(cls.ERROR_PATTERNS)
+
     @classmethod
     def classify_error(cls, error_message: str, status_code: Optional[int] = None) -> ErrorType:
         """
@@ -90,14 +127,9 @@ class ServiceErrorClassifier:
         if status_code and status_code in cls.HTTP_STATUS_MAPPING:
             return cls.HTTP_STATUS_MAPPING[status_code]
 
-        error_lower = error_message.lower()
-
-        for error_type, patterns in cls.ERROR_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, error_lower, re.IGNORECASE):
-                    return error_type
-
-        return ErrorType.UNKNOWN
+        error_regex, error_types = cls._COMPILED_ERROR_PATTERNS
+        ranked = first_ranked_match(error_regex, error_message)
+        return error_types[ranked[0]] if ranked else ErrorType.UNKNOWN
 
     @classmethod
     def get_user_friendly_message(cls, error_type: ErrorType, service_name: str, service_url: str) -> str:
@@ -112,18 +144,8 @@ class ServiceErrorClassifier:
         Returns:
             str: A user-friendly error message
         """
-        messages = {
-            ErrorType.CONNECTION_REFUSED: f"{service_name} service refused connection at {service_url}. Check if {service_name} is running.",
-            ErrorType.DNS_RESOLUTION_FAILED: f"{service_name} service not reachable at {service_url}. This is expected when running locally. Deploy to OpenShift to access {service_name}.",
-            ErrorType.HTTP_ERROR: f"HTTP error accessing {service_name} at {service_url}. Check if the service is properly configured.",
-            ErrorType.TIMEOUT: f"Request to {service_name} timed out at {service_url}. The service may be overloaded or unreachable.",
-            ErrorType.AUTHENTICATION_FAILED: f"Authentication failed when accessing {service_name} at {service_url}. Check your credentials.",
-            ErrorType.SERVICE_UNAVAILABLE: f"{service_name} service is temporarily unavailable at {service_url}. Please try again later.",
-            ErrorType.RATE_LIMITED: f"Rate limit exceeded for {service_name} at {service_url}. Please wait before making more requests.",
-            ErrorType.UNKNOWN: f"Unexpected error accessing {service_name} at {service_url}"
-        }
-
-        return messages.get(error_type, messages[ErrorType.UNKNOWN])
+        template = cls.MESSAGE_TEMPLATES.get(error_type, cls.MESSAGE_TEMPLATES[ErrorType.UNKNOWN])
+        return template.format(service_name=service_name, service_url=service_url)
 
 
 # Service-specific error classifiers for backward compatibility
@@ -5,22 +5,49 @@ This module provides a unified HTTP client interface for making requests
 to various observability services (Tempo, Prometheus, Thanos, etc.).
 """
 
+import asyncio
+import functools
+import os
+import ssl
+import time
 import httpx
 import requests
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 import logging
 
-from .config import VERIFY_SSL, K8S_SERVICE_ACCOUNT_TOKEN_PATH, DEV_FALLBACK_TOKEN
+from .config import (
+    VERIFY_SSL, K8S_SERVICE_ACCOUNT_TOKEN_PATH, DEV_FALLBACK_TOKEN, SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_ssl_context(verify: Union[bool, str]) -> Union[ssl.SSLContext, bool]:
+    """
+    Get the SSL context for a verify setting (bool or CA bundle path).
+    
+    Built once per setting and shared by every async client, so the CA bundle
+    is loaded a single time instead of on each client creation.
+    """
+    if verify is False:
+        return False
+    if isinstance(verify, str):
+        # CA bundle file or directory, as httpx would interpret a verify path
+        if os.path.isdir(verify):
+            return ssl.create_default_context(capath=verify)
+        return ssl.create_default_context(cafile=verify)
+    return httpx.create_ssl_context()
+
+
 class HTTPClient:
     """Centralized HTTP client for observability services."""
     
     DEFAULT_TIMEOUT = 30.0
     DEFAULT_VERIFY_SSL = VERIFY_SSL
+    # Response bodies at least this large are JSON-decoded in a worker thread
+    LARGE_RESPONSE_BYTES = 1024 * 1024
     
     def __init__(self, base_url: str, timeout: float = DEFAULT_TIMEOUT, verify_ssl: bool = DEFAULT_VERIFY_SSL):
         """
@@ -34,15 +61,96 @@ class HTTPClient:
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client_closer: Optional[asyncio.Task] = None
+        self._token_cache: Optional[Tuple[str, float]] = None
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async client, creating it on first use.
+        
+        The client keeps connections alive between requests. Its pool is bound
+        to the event loop it was created on, so a new client is created
+        whenever the running loop changes (e.g. successive asyncio.run calls).
+        Each client is closed on its own loop, either when it is replaced or
+        when that loop shuts down.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_client
+        if client is None or client.is_closed or self._async_client_loop is not loop:
+            self._release_async_client()
+            client = httpx.AsyncClient(timeout=self.timeout, verify=_get_ssl_context(self.verify_ssl))
+            self._async_client = client
+            self._async_client_loop = loop
+            self._async_client_closer = loop.create_task(self._close_on_loop_shutdown(client))
+        return client
+    
+    @staticmethod
+    async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> None:
+        """
+        Wait until cancelled, then close the client on the loop that owns it.
+        
+        asyncio.run cancels pending tasks before closing its loop, so pooled
+        connections are released even when aclose() is never called.
+        """
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await client.aclose()
+    
+    def _release_async_client(self) -> None:
+        """Forget the pooled client and ask its loop to close it."""
+        closer, loop = self._async_client_closer, self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        self._async_client_closer = None
+        if closer is not None and not closer.done() and not loop.is_closed():
+            loop.call_soon_threadsafe(closer.cancel)
+    
+    async def _decode_json(self, response: httpx.Response) -> Dict[str, Any]:
+        """
+        Decode a JSON response body.
+        
+        Large bodies (e.g. trace details with thousands of spans) are decoded
+        with asyncio.to_thread so the event loop keeps serving other requests.
+        """
+        if len(response.content) >= self.LARGE_RESPONSE_BYTES:
+            return await asyncio.to_thread(response.json)
+        return response.json()
+    
+    async def aclose(self) -> None:
+        """Close the pooled async client and release its connections."""
+        client = self._async_client
+        same_loop = self._async_client_loop is asyncio.get_running_loop()
+        self._release_async_client()
+        if client is not None and same_loop:
+            await client.aclose()
     
     def _get_service_account_token(self) -> str:
-        """Get the service account token for authentication."""
+        """
+        Get the service account token for authentication.
+        
+        The token is cached for SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS so the
+        token file is not re-read on every request, while rotated tokens are
+        still picked up.
+        """
+        cached = self._token_cache
+        if cached is not None and time.monotonic() - cached[1] < SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS:
+            return cached[0]
+        
+        token = self._read_service_account_token()
+        if SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS > 0:
+            self._token_cache = (token, time.monotonic())
+        return token
+    
+    def _read_service_account_token(self) -> str:
+        """Read the service account token from disk or the environment."""
         try:
             with open(K8S_SERVICE_ACCOUNT_TOKEN_PATH, 'r') as f:
                 return f.read().strip()
         except FileNotFoundError:
             # Fallback for local development
-            import os
             token = os.getenv("TEMPO_TOKEN") or os.getenv("THANOS_TOKEN")
             if token:
                 return token
@@ -66,7 +174,7 @@ class HTTPClient:
                 if token and token != DEV_FALLBACK_TOKEN:
                     headers["Authorization"] = f"Bearer {token}"
             except Exception as e:
-                logger.debug(f"No service account token available: {e}")
+                logger.debug("No service account token available: %s", e)
         
         return headers
     
@@ -91,11 +199,11 @@ class HTTPClient:
             request_headers.update(headers)
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=self.verify_ssl) as client:
-                logger.debug(f"Making async GET request to: {url}")
-                response = await client.get(url, params=params, headers=request_headers)
-                response.raise_for_status()
-                return response.json()
+            client = self._get_async_client()
+            logger.debug("Making async GET request to: %s", url)
+            response = await client.get(url, params=params, headers=request_headers)
+            response.raise_for_status()
+            return await self._decode_json(response)
         except httpx.HTTPError as e:
             logger.error(f"Async GET request failed: {e}")
             raise
@@ -155,11 +263,11 @@ class HTTPClient:
             request_headers.update(headers)
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=self.verify_ssl) as client:
-                logger.debug(f"Making async POST request to: {url}")
-                response = await client.post(url, json=data, headers=request_headers)
-                response.raise_for_status()
-                return response.json()
+            client = self._get_async_client()
+            logger.debug("Making async POST request to: %s", url)
+            response = await client.post(url, json=data, headers=request_headers)
+            response.raise_for_status()
+            return await self._decode_json(response)
         except httpx.HTTPError as e:
             logger.error(f"Async POST request failed: {e}")
             raise
@@ -179,13 +287,21 @@ class TempoClient(HTTPClient):
         """
         super().__init__(tempo_url, timeout)
         self.tenant_id = tenant_id
+        
+        # Tenant and base URL are fixed for the client's lifetime, so build
+        # the endpoints and static headers once instead of on every request
+        api_prefix = f"/api/traces/v1/{tenant_id}/api"
+        self._services_endpoint = f"{api_prefix}/services"
+        self._traces_endpoint = f"{api_prefix}/traces"
+        self.traces_url = f"{self.base_url}{self._traces_endpoint}"
+        self._base_tempo_headers = {
+            "X-Scope-OrgID": tenant_id,
+            "Content-Type": "application/json"
+        }
     
     def _get_tempo_headers(self) -> Dict[str, str]:
         """Get headers specific to Tempo API requests."""
-        headers = {
-            "X-Scope-OrgID": self.tenant_id,
-            "Content-Type": "application/json"
-        }
+        headers = dict(self._base_tempo_headers)
         
         # Add authentication if available
         auth_headers = self._get_auth_headers()
@@ -196,8 +312,7 @@ class TempoClient(HTTPClient):
     async def get_services(self) -> List[str]:
         """Get list of available services from Tempo/Jaeger."""
         try:
-            endpoint = f"/api/traces/v1/{self.tenant_id}/api/services"
-            response = await self.get_async(endpoint, headers=self._get_tempo_headers())
+            response = await self.get_async(self._services_endpoint, headers=self._get_tempo_headers())
             return response.get("data", [])
         except Exception as e:
             logger.error(f"Error getting services: {e}")
@@ -214,8 +329,7 @@ class TempoClient(HTTPClient):
             Query response data
         """
         try:
-            endpoint = f"/api/traces/v1/{self.tenant_id}/api/traces"
-            response = await self.get_async(endpoint, params=params, headers=self._get_tempo_headers())
+            response = await self.get_async(self._traces_endpoint, params=params, headers=self._get_tempo_headers())
             return response
         except Exception as e:
             logger.error(f"Error querying traces: {e}")
@@ -232,7 +346,7 @@ class TempoClient(HTTPClient):
             Trace details data
         """
         try:
-            endpoint = f"/api/traces/v1/{self.tenant_id}/api/traces/{trace_id}"
+            endpoint = f"{self._traces_endpoint}/{trace_id}"
             response = await self.get_async(endpoint, headers=self._get_tempo_headers())
             return response
         except Exception as e:
@@ -7,8 +7,15 @@ Moved from metrics_api.py to separate business logic
 import os
 import json
 import re
+import time
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import functools
+import unicodedata
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from common.pylogger import get_python_logger
 
@@ -21,14 +28,177 @@ get_python_logger()
 
 logger = logging.getLogger(__name__)
 
-from .config import CHAT_SCOPE_FLEET_WIDE, FLEET_WIDE_DISPLAY
+from .config import (
+    CHAT_SCOPE_FLEET_WIDE,
+    FLEET_WIDE_DISPLAY,
+    LLM_SUMMARY_CACHE_MAXSIZE,
+    LLM_SUMMARY_CACHE_TTL_SECONDS,
+)
+
+# Precompiled cleanup patterns for LLM summaries (applied in order)
+_CODE_BLOCK_RE = re.compile(r'```.*?```', re.DOTALL)
+_INSTRUCTION_RES = (
+    re.compile(r'Please format.*?\.', re.DOTALL),
+    re.compile(r'🔍 Scope:.*?$', re.MULTILINE),
+    re.compile(r'Do not include.*?\.', re.DOTALL),
+    re.compile(r'Keep.*?\.', re.DOTALL),
+)
+# Single pass for meta-comments that run to the end of a line
+_TRAILING_META_RE = re.compile(r'(?:Please format|🔍 Scope:|Note:).*?$', re.MULTILINE)
+_INLINE_NOTE_RE = re.compile(r'\(Note:.*?\)', re.DOTALL)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
+# Questions mentioning any of these words are routed to alert analysis
+_ALERT_QUESTION_RE = re.compile(r"alert|firing|warning|critical|problem|issue", re.IGNORECASE)
+
+# Alert severity sort order; unknown severities go last
+_LOWEST_SEVERITY_RANK = 3
+_SEVERITY_RANK = {
+    "critical": 0,
+    "warning": 1,
+    "info": 2,
+    "low": _LOWEST_SEVERITY_RANK,
+    "none": _LOWEST_SEVERITY_RANK,
+}
+
+# Static prompt sections; only the variable parts are formatted per call
+_METRIC_SUMMARY_INSTRUCTIONS = """Provide ONLY a structured summary in this exact format (no additional text or instructions):
+Current value: [value]
+Meaning: [brief explanation]
+Immediate concern: [None or specific concern]
+Key insight: [one key observation]
+
+Do not include any formatting instructions, notes, or additional commentary."""
+
+_ALERT_ANALYSIS_INSTRUCTIONS = """For each alert, provide an analysis with 5-7 lines maximum:
+- **Severity:** Severity of the alert
+- **Impact:** Impact assessment
+- **Action:** One key action needed to resolve the alert
+- **Troubleshooting commands:** Any commands needed to investigate the alert.
+- **Namespace:** Namespace of the alert if available.
+
+In your response, use the following format as the title of each alert section:
+### [Alert Name]
+
+Keep your response concise and do NOT add any additional notes or commentary.
+"""
+
+
+def _build_metric_summary_prompt(namespace: str, question: str, context: str) -> str:
+    """Build the metric summary prompt."""
+    return "".join([
+        "You are a senior Site Reliability Engineer (SRE) analyzing metrics for namespace: ", namespace, ".\n\n",
+        "Question: ", question, "\n\n",
+        "Metrics Data:\n", context, "\n\n",
+        _METRIC_SUMMARY_INSTRUCTIONS,
+    ])
+
+
+def _build_alert_analysis_prompt(ns_info: str, alert_list: str) -> str:
+    """Build the alert analysis prompt."""
+    return "".join([
+        "You are a senior Site Reliability Engineer (SRE) analyzing alerts for ", ns_info, ".\n\n",
+        "Firing Alerts:\n", alert_list, "\n\n",
+        _ALERT_ANALYSIS_INSTRUCTIONS,
+    ])
+
+
+# In-memory LRU cache of LLM responses: key -> (stored_at, response)
+_llm_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+
+def _llm_cache_key(prompt: str, model_id: Optional[str], response_type: ResponseType,
+                   api_key: Optional[str], max_tokens: int) -> str:
+    """Build a cache key from the request; the API key only contributes to the digest."""
+    material = "|".join([
+        str(model_id),
+        str(max_tokens),
+        response_type.value,
+        hashlib.sha256((api_key or "").encode()).hexdigest(),
+        prompt,
+    ])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _cached_summarize(prompt: str, model_id: Optional[str], response_type: ResponseType,
+                      api_key: Optional[str] = None, max_tokens: int = 300) -> str:
+    """
+    Call summarize_with_llm, reusing the response for identical recent requests.
+
+    Empty responses and errors are never cached.
+    """
+    if LLM_SUMMARY_CACHE_TTL_SECONDS <= 0 or LLM_SUMMARY_CACHE_MAXSIZE <= 0:
+        return summarize_with_llm(prompt, model_id, response_type, api_key=api_key, max_tokens=max_tokens)
+
+    key = _llm_cache_key(prompt, model_id, response_type, api_key, max_tokens)
+    now = time.monotonic()
+
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is not None:
+            stored_at, cached_response = entry
+            if now - stored_at < LLM_SUMMARY_CACHE_TTL_SECONDS:
+                _llm_cache.move_to_end(key)
+                logger.debug("LLM summary cache hit for model %s", model_id)
+                return cached_response
+            del _llm_cache[key]
+
+    response = summarize_with_llm(prompt, model_id, response_type, api_key=api_key, max_tokens=max_tokens)
+
+    if response and response.strip():
+        with _llm_cache_lock:
+            _llm_cache[key] = (now, response)
+            _llm_cache.move_to_end(key)
+            while len(_llm_cache) > LLM_SUMMARY_CACHE_MAXSIZE:
+                _llm_cache.popitem(last=False)
+
+    return response
+
+
+def clear_llm_summary_cache() -> None:
+    """Drop all cached LLM responses."""
+    with _llm_cache_lock:
+        _llm_cache.clear()
+
+
+def _latest_metric_value(metric_info: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+    """
+    Return (promql, latest_value) for the first series of a Thanos result.
+
+    Returns None when the result has no series or no samples.
+    """
+    try:
+        result = metric_info["data"]["result"]
+        if not result:
+            return None
+        # Get the latest data point
+        latest_point = result[0] if isinstance(result, list) else result
+        values = latest_point["values"]
+        if not values:
+            return None
+        last_sample = values[-1]
+        latest_value = last_sample[1] if len(last_sample) > 1 else "N/A"
+    except (KeyError, IndexError, TypeError):
+        return None
+    return metric_info.get("promql", ""), latest_value
+
+
+@functools.lru_cache(maxsize=256)
+def _compute_scope(namespace: str) -> str:
+    """Describe the alert scope for a namespace selection."""
+    if namespace == "" or namespace == FLEET_WIDE_DISPLAY:
+        return CHAT_SCOPE_FLEET_WIDE
+    return f"namespace '{namespace}'"
+
 
 def generate_llm_summary(question: str, thanos_data: Dict[str, Any], model_id: str, api_key: str, namespace: str) -> str:
     """
     Generate LLM summary from Thanos data
     """
     try:
-        logger.info("Generating LLM summary for: %s", question)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generating LLM summary for: %s", question)
         
         # Check if we have any successful data
         successful_data = {k: v for k, v in thanos_data.items() if v.get("status") == "success"}
@@ -36,12 +206,10 @@ def generate_llm_summary(question: str, thanos_data: Dict[str, Any], model_id: s
         if not successful_data:
             return "❌ No data available to analyze. Please check your query and try again."
 
-        question_lower = question.lower()
-
         # === SPECIAL HANDLING FOR ALERTS ===
-        if any(word in question_lower for word in ["alert", "alerts", "firing", "warning", "critical", "problem", "issue"]):
+        if _ALERT_QUESTION_RE.search(question):
             alert_infos = extract_alert_info_from_thanos_data(thanos_data)
-            scope = CHAT_SCOPE_FLEET_WIDE if (namespace == "" or namespace == FLEET_WIDE_DISPLAY) else f"namespace '{namespace}'"
+            scope = _compute_scope(namespace)
             if alert_infos:
                 alert_analysis = generate_alert_analysis_with_llm(alert_infos, namespace, model_id=model_id, api_key=api_key)
                 return f"🚨 **TOTAL OF {len(alert_infos)} ALERT(S) FOUND IN {scope.upper()}**\n\n{alert_analysis}"
@@ -51,26 +219,13 @@ def generate_llm_summary(question: str, thanos_data: Dict[str, Any], model_id: s
         # === REGULAR METRIC HANDLING ===
         # Build context for LLM
         context_parts = []
+        append_context = context_parts.append
         
-        for metric_key, metric_info in successful_data.items():
-            promql = metric_info.get("promql", "")
-            data = metric_info.get("data", {})
-            
-            if not data or not data.get("result"):
-                continue
-            
-            # Extract the most recent value
-            result = data["result"]
-            if result and len(result) > 0:
-                # Get the latest data point
-                latest_point = result[0] if isinstance(result, list) else result
-                
-                if isinstance(latest_point, dict) and "values" in latest_point:
-                    values = latest_point["values"]
-                    if values and len(values) > 0:
-                        # Get the most recent value
-                        latest_value = values[-1][1] if len(values[-1]) > 1 else "N/A"
-                        context_parts.append(f"{promql}: {latest_value}")
+        for metric_info in successful_data.values():
+            latest = _latest_metric_value(metric_info)
+            if latest is not None:
+                promql, latest_value = latest
+                append_context(f"{promql}: {latest_value}")
         
         if not context_parts:
             return "❌ No valid data points found. Please check your query and try again."
@@ -78,24 +233,11 @@ def generate_llm_summary(question: str, thanos_data: Dict[str, Any], model_id: s
         # Build the prompt
         context = "\n".join(context_parts)
         
-        prompt = f"""You are a senior Site Reliability Engineer (SRE) analyzing metrics for namespace: {namespace}.
-
-Question: {question}
-
-Metrics Data:
-{context}
-
-Provide ONLY a structured summary in this exact format (no additional text or instructions):
-Current value: [value]
-Meaning: [brief explanation]
-Immediate concern: [None or specific concern]
-Key insight: [one key observation]
-
-Do not include any formatting instructions, notes, or additional commentary."""
+        prompt = _build_metric_summary_prompt(namespace, question, context)
 
         # Generate summary with LLM
         # Use GENERAL_CHAT validation for free-form summaries
-        summary = summarize_with_llm(
+        summary = _cached_summarize(
             prompt,
             model_id,
             ResponseType.GENERAL_CHAT,
@@ -133,22 +275,18 @@ def _clean_llm_summary_string(summary: str) -> str:
     summary = summary.strip()
     
     # Remove markdown code blocks
-    summary = re.sub(r'```.*?```', '', summary, flags=re.DOTALL)
+    summary = _CODE_BLOCK_RE.sub('', summary)
     
     # Remove formatting instructions and meta-comments
-    summary = re.sub(r'Please format.*?\.', '', summary, flags=re.DOTALL)
-    summary = re.sub(r'🔍 Scope:.*?$', '', summary, flags=re.MULTILINE)
-    summary = re.sub(r'Do not include.*?\.', '', summary, flags=re.DOTALL)
-    summary = re.sub(r'Keep.*?\.', '', summary, flags=re.DOTALL)
+    for pattern in _INSTRUCTION_RES:
+        summary = pattern.sub('', summary)
     
     # Remove any remaining meta-comments that might be attached to sections
-    summary = re.sub(r'Please format.*?$', '', summary, flags=re.MULTILINE)
-    summary = re.sub(r'🔍 Scope:.*?$', '', summary, flags=re.MULTILINE)
-    summary = re.sub(r'Note:.*?$', '', summary, flags=re.MULTILINE)
-    summary = re.sub(r'\(Note:.*?\)', '', summary, flags=re.DOTALL)
+    summary = _TRAILING_META_RE.sub('', summary)
+    summary = _INLINE_NOTE_RE.sub('', summary)
     
     # Remove extra whitespace
-    summary = re.sub(r'\n\s*\n', '\n\n', summary)
+    summary = _BLANK_LINES_RE.sub('\n\n', summary)
     
     # Remove leading/trailing whitespace
     summary = summary.strip()
@@ -163,9 +301,9 @@ def _truncate_summary(summary: str) -> str:
     if not summary:
         return ""
     
-    # Split into lines and take first 5 non-empty lines
-    lines = [line.strip() for line in summary.split('\n') if line.strip()]
-    truncated_lines = lines[:5]
+    # Take first 5 non-empty lines, stopping as soon as they are found
+    stripped_lines = (line.strip() for line in summary.split('\n'))
+    truncated_lines = islice((line for line in stripped_lines if line), 5)
     
     return '\n'.join(truncated_lines)
 
@@ -177,37 +315,39 @@ def _format_summary_structure(summary: str) -> str:
     if not summary:
         return ""
     
+    # Locate each section marker once and reuse the positions below
+    current_pos = summary.find('Current value:')
+    meaning_pos = summary.find('Meaning:')
+
     # Check if summary contains structured format
-    if 'Current value:' in summary and 'Meaning:' in summary:
+    if current_pos != -1 and meaning_pos != -1:
+        concern_pos = summary.find('Immediate concern:')
+        insight_pos = summary.find('Key insight:')
+
         # Extract and format structured parts
         formatted_parts = []
         
         # Extract Current value
-        if 'Current value:' in summary:
-            current_start = summary.find('Current value:') + len('Current value:')
-            meaning_start = summary.find('Meaning:')
-            if meaning_start > current_start:
-                current_value = summary[current_start:meaning_start].strip()
-                formatted_parts.append(f"Current value: {current_value}")
+        current_start = current_pos + len('Current value:')
+        if meaning_pos > current_start:
+            current_value = summary[current_start:meaning_pos].strip()
+            formatted_parts.append(f"Current value: {current_value}")
         
         # Extract Meaning
-        if 'Meaning:' in summary:
-            meaning_start = summary.find('Meaning:') + len('Meaning:')
-            concern_start = summary.find('Immediate concern:')
-            if concern_start > meaning_start:
-                meaning_text = summary[meaning_start:concern_start].strip()
-                formatted_parts.append(f"Meaning: {meaning_text}")
-            else:
-                # If no Immediate concern, take everything after Meaning
-                meaning_text = summary[meaning_start:].strip()
-                formatted_parts.append(f"Meaning: {meaning_text}")
+        meaning_start = meaning_pos + len('Meaning:')
+        if concern_pos > meaning_start:
+            meaning_text = summary[meaning_start:concern_pos].strip()
+            formatted_parts.append(f"Meaning: {meaning_text}")
+        else:
+            # If no Immediate concern, take everything after Meaning
+            meaning_text = summary[meaning_start:].strip()
+            formatted_parts.append(f"Meaning: {meaning_text}")
         
         # Extract Immediate concern
-        if 'Immediate concern:' in summary:
-            concern_start = summary.find('Immediate concern:') + len('Immediate concern:')
-            insight_start = summary.find('Key insight:')
-            if insight_start > concern_start:
-                concern_text = summary[concern_start:insight_start].strip()
+        if concern_pos != -1:
+            concern_start = concern_pos + len('Immediate concern:')
+            if insight_pos > concern_start:
+                concern_text = summary[concern_start:insight_pos].strip()
                 formatted_parts.append(f"Immediate concern: {concern_text}")
             else:
                 # If no Key insight, take everything after Immediate concern
@@ -215,13 +355,11 @@ def _format_summary_structure(summary: str) -> str:
                 formatted_parts.append(f"Immediate concern: {concern_text}")
         
         # Extract Key insight
-        if 'Key insight:' in summary:
-            insight_start = summary.find('Key insight:') + len('Key insight:')
+        if insight_pos != -1:
+            insight_start = insight_pos + len('Key insight:')
             insight_text = summary[insight_start:].strip()
             # Clean up any unwanted text that might be attached
-            insight_text = re.sub(r'Please format.*?$', '', insight_text, flags=re.MULTILINE)
-            insight_text = re.sub(r'🔍 Scope:.*?$', '', insight_text, flags=re.MULTILINE)
-            insight_text = re.sub(r'Note:.*?$', '', insight_text, flags=re.MULTILINE)
+            insight_text = _TRAILING_META_RE.sub('', insight_text)
             insight_text = insight_text.strip()
             formatted_parts.append(f"Key insight: {insight_text}")
         
@@ -253,25 +391,9 @@ def generate_alert_analysis_with_llm(alert_infos: List[Dict[str, str]], namespac
         sorted_alert_infos = sort_alert_infos_by_severity(alert_infos)
         alert_list = "\n".join([_format_alert(info) for info in sorted_alert_infos])
         ns_info = f"namespace: {namespace}" if namespace != "FLEET_WIDE" else "FLEET_WIDE"
-        prompt = f"""You are a senior Site Reliability Engineer (SRE) analyzing alerts for {ns_info}.
-
-Firing Alerts:
-{alert_list}
-
-For each alert, provide an analysis with 5-7 lines maximum:
-- **Severity:** Severity of the alert
-- **Impact:** Impact assessment
-- **Action:** One key action needed to resolve the alert
-- **Troubleshooting commands:** Any commands needed to investigate the alert.
-- **Namespace:** Namespace of the alert if available.
+        prompt = _build_alert_analysis_prompt(ns_info, alert_list)
 
-In your response, use the following format as the title of each alert section:
-### [Alert Name]
-
-Keep your response concise and do NOT add any additional notes or commentary.
-"""
-
-        summary = summarize_with_llm(
+        summary = _cached_summarize(
             prompt,
             model_id,
             ResponseType.GENERAL_CHAT,
@@ -298,29 +420,34 @@ def extract_alert_info_from_thanos_data(thanos_data: Dict[str, Any]) -> List[Dic
     """
     alert_infos: List[Dict[str, str]] = []
     seen_alert_names = set()
-
-    for metric_key, metric_info in thanos_data.items():
-        if metric_info.get("status") == "success":
-            data = metric_info.get("data", {})
-            result = data.get("result", [])
-
-            if result and len(result) > 0:
-                for series in result:
-                    if isinstance(series, dict) and "metric" in series:
-                        metric = series["metric"]
-                        alert_name = metric.get("alertname")
-                        if not alert_name or alert_name in seen_alert_names:
-                            continue
-                        severity = metric.get("severity", "unknown")
-                        namespace_val = metric.get("namespace", "")
-                        alert_infos.append(
-                            {
-                                "alertname": alert_name,
-                                "namespace": namespace_val,
-                                "severity": severity,
-                            }
-                        )
-                        seen_alert_names.add(alert_name)
+    append_alert = alert_infos.append
+    mark_seen = seen_alert_names.add
+
+    for metric_info in thanos_data.values():
+        if metric_info.get("status") != "success":
+            continue
+        result = (metric_info.get("data") or {}).get("result")
+        if not result:
+            continue
+
+        for series in result:
+            if not isinstance(series, dict):
+                continue
+            metric = series.get("metric")
+            if metric is None:
+                continue
+            metric_get = metric.get
+            alert_name = metric_get("alertname")
+            if not alert_name or alert_name in seen_alert_names:
+                continue
+            append_alert(
+                {
+                    "alertname": alert_name,
+                    "namespace": metric_get("namespace", ""),
+                    "severity": metric_get("severity", "unknown"),
+                }
+            )
+            mark_seen(alert_name)
 
     return alert_infos
 
@@ -333,23 +460,11 @@ def sort_alert_infos_by_severity(alert_infos: List[Dict[str, str]]) -> List[Dict
     Each alert info dict is expected to have a 'severity' field.
     Unknown severities are treated as lowest priority.
     """
-    def severity_rank(severity_value: Optional[str]) -> int:
-        value = (severity_value or "").strip().lower()
-        if value == "critical":
-            return 0
-        if value == "warning":
-            return 1
-        if value == "info":
-            return 2
-        if value in ("low", "none"):
-            return 3
-        return 3  # Unknowns go last
-
     # Stable sort; secondary key by alert name for deterministic output
     return sorted(
         alert_infos,
         key=lambda info: (
-            severity_rank(info.get("severity")),
+            _SEVERITY_RANK.get((info.get("severity") or "").strip().lower(), _LOWEST_SEVERITY_RANK),
             (info.get("alertname") or "").lower(),
         ),
     )
@@ -378,7 +493,6 @@ def clean_alert_analysis_output(raw_output: str, alert_infos: List[Dict[str, str
 
     # Normalize to avoid Unicode punctuation issues
     try:
-        import unicodedata
         text = unicodedata.normalize("NFKC", text)
         alert_names = [unicodedata.normalize("NFKC", name) for name in alert_names]
     except Exception:
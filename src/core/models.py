@@ -7,7 +7,7 @@ providing a centralized location for data validation and serialization.
 
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
 
 # --- Request Models ---
@@ -103,7 +103,7 @@ class MetricsCalculationResponse(BaseModel):
 
 # --- Tempo Models ---
 
-@dataclass
+@dataclass(slots=True)
 class QueryResponse:
     """Response structure for trace queries."""
     success: bool
@@ -123,11 +123,14 @@ class QueryResponse:
     headers: Optional[Dict[str, str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary, excluding None values."""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        """Convert to dictionary, excluding None values.
+
+        Shallow on purpose: nested trace data is shared, not deep-copied.
+        """
+        return {f.name: v for f in fields(self) if (v := getattr(self, f.name)) is not None}
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceDetailsResponse:
     """Response structure for trace details."""
     success: bool
@@ -136,4 +139,4 @@ class TraceDetailsResponse:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, excluding None values."""
-        return {k: v for k, v in asdict(self).items() if v is not None} 
\ No newline at end of file
+        return {f.name: v for f in fields(self) if (v := getattr(self, f.name)) is not None} 
\ No newline at end of file
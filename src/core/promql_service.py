@@ -4,6 +4,7 @@ Core PromQL Generation Service
 Moved from metrics_api.py to separate business logic
 """
 
+import functools
 import os
 import re
 from typing import Dict, List, Optional, Any, Tuple
@@ -20,6 +21,129 @@ logger = logging.getLogger(__name__)
 
 # Import configuration
 from .config import PROMETHEUS_URL, THANOS_TOKEN, VERIFY_SSL as verify, CHAT_SCOPE_FLEET_WIDE, FLEET_WIDE_DISPLAY
+from .regex_utils import compile_ranked, first_ranked_match
+
+# Time period patterns for extract_time_period_from_question, compiled once at import
+_TIME_PERIOD_PATTERNS = (
+    # "1 hour", "2 hours", "1.5 hours" 
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:hour|hr|hrs|hours)'), lambda m: f"{int(float(m.group(1)) * 60)}m" if float(m.group(1)) < 1 else f"{int(float(m.group(1)))}h"),
+    
+    # "30 minutes", "45 mins"
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:minute|min|mins|minutes)'), lambda m: f"{int(float(m.group(1)))}m"),
+    
+    # "2 days", "1 day" 
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:day|days)'), lambda m: f"{int(float(m.group(1)) * 24)}h"),
+    
+    # "1h", "30m", "2d" (already in PromQL format)
+    (re.compile(r'(\d+(?:\.\d+)?[hdm])'), lambda m: m.group(1)),
+)
+
+# Rate interval by query range: (max range in hours, interval), smallest first
+_RATE_INTERVAL_STEPS = (
+    (1, "5m"),  # For 1 hour, use 5m intervals (12 data points)
+    (6, "15m"),  # For up to 6 hours, use 15m intervals
+    (24, "1h"),  # For up to a day, use 1h intervals
+)
+_LONG_RANGE_RATE_INTERVAL = "6h"  # For longer periods, use 6h intervals
+
+# Keyword groups for select_queries_directly, checked in ladder order
+_ALERT_KEYWORDS = ("alert", "alerts", "firing", "warning", "critical", "problem", "issue")
+_LATENCY_KEYWORDS = ("latency", "p95", "p99", "percentile", "response time", "slow", "fast")
+_VLLM_REQUEST_KEYWORDS = ("vllm request", "model request", "inference request", "llm request")
+_TOKEN_KEYWORDS = ("token", "tokens", "prompt", "generation", "output")
+_GPU_KEYWORDS = ("gpu", "temperature", "utilization", "power")
+_POD_KEYWORDS = ("pod", "pods", "number of pods", "how many pods")
+_POD_RUNNING_KEYWORDS = ("running", "active", "up", "healthy")
+_POD_FAILED_KEYWORDS = ("failed", "failing", "crashed", "error", "broken")
+_POD_PENDING_KEYWORDS = ("pending", "waiting", "queued", "starting")
+_POD_SUCCEEDED_KEYWORDS = ("succeeded", "completed", "finished")
+_DEPLOYMENT_KEYWORDS = ("deployment", "deployments", "deploy")
+_SERVICE_KEYWORDS = ("service", "services", "svc")
+_NODE_KEYWORDS = ("node", "nodes")
+_NETWORK_KEYWORDS = ("network", "bandwidth", "traffic", "connection")
+_MEMORY_KEYWORDS = ("memory", "mem", "ram")
+_CPU_KEYWORDS = ("cpu", "processor")
+_STORAGE_KEYWORDS = ("storage", "disk", "volume", "persistent")
+
+# Ladder categories in priority order
+_QUESTION_CATEGORIES = (
+    ("alert", _ALERT_KEYWORDS),
+    ("latency", _LATENCY_KEYWORDS),
+    ("vllm_request", _VLLM_REQUEST_KEYWORDS),
+    ("token", _TOKEN_KEYWORDS),
+    ("gpu", _GPU_KEYWORDS),
+    ("pod", _POD_KEYWORDS),
+    ("deployment", _DEPLOYMENT_KEYWORDS),
+    ("service", _SERVICE_KEYWORDS),
+    ("node", _NODE_KEYWORDS),
+    ("network", _NETWORK_KEYWORDS),
+    ("memory", _MEMORY_KEYWORDS),
+    ("cpu", _CPU_KEYWORDS),
+    ("storage", _STORAGE_KEYWORDS),
+)
+
+# Display names used when logging the detected category
+_QUESTION_CATEGORY_LABELS = {
+    "alert": "Alerts",
+    "latency": "Latency",
+    "vllm_request": "vLLM Request",
+    "token": "Token",
+    "gpu": "GPU",
+    "pod": "Pod",
+    "deployment": "Deployment",
+    "service": "Service",
+    "node": "Node",
+    "network": "Network",
+    "memory": "Memory",
+    "cpu": "CPU",
+    "storage": "Storage",
+}
+_QUESTION_CATEGORY_RE = compile_ranked(
+    ["|".join(map(re.escape, keywords)) for _, keywords in _QUESTION_CATEGORIES]
+)
+
+
+def _detect_question_category(question_lower: str) -> Optional[str]:
+    """Return the highest-priority ladder category mentioned in the question, if any"""
+    ranked = first_ranked_match(_QUESTION_CATEGORY_RE, question_lower)
+    return _QUESTION_CATEGORIES[ranked[0]][0] if ranked else None
+
+
+def _detect_pod_phase(question_lower: str) -> str:
+    """Return the pod phase a pod question asks about, defaulting to Running"""
+    if any(word in question_lower for word in _POD_RUNNING_KEYWORDS):
+        return "Running"
+    elif any(word in question_lower for word in _POD_FAILED_KEYWORDS):
+        return "Failed"
+    elif any(word in question_lower for word in _POD_PENDING_KEYWORDS):
+        return "Pending"
+    elif any(word in question_lower for word in _POD_SUCCEEDED_KEYWORDS):
+        return "Succeeded"
+    return "Running"
+
+
+def _vllm_label_selector(namespace: Optional[str], model_name: str, is_fleet_wide: bool) -> str:
+    """Generate labels for vLLM metrics"""
+    if is_fleet_wide:
+        return f'{{model_name="{model_name}"}}' if model_name else ""
+    else:
+        return f'{{namespace="{namespace}", model_name="{model_name}"}}' if model_name else f'{{namespace="{namespace}"}}'
+
+
+def _default_queries(namespace: Optional[str], model_name: str, is_fleet_wide: bool) -> Tuple[str, ...]:
+    """Default queries used when no specific pattern is detected"""
+    if is_fleet_wide:
+        return (
+            f'vllm:num_requests_running{{model_name="{model_name}"}}',  # vLLM requests, no namespace filter
+            'sum(kube_pod_status_phase{phase="Running"})',  # Running pods
+            'avg(DCGM_FI_DEV_GPU_UTIL)'  # GPU utilization
+        )
+    return (
+        f'vllm:num_requests_running{{namespace="{namespace}", model_name="{model_name}"}}',  # vLLM requests
+        f'sum(kube_pod_status_phase{{phase="Running", namespace="{namespace}"}})',  # Running pods
+        'avg(DCGM_FI_DEV_GPU_UTIL)'  # GPU utilization
+    )
+
 
 def generate_promql_from_question(question: str, namespace: Optional[str], model_name: str, start_ts: int, end_ts: int, is_fleet_wide: bool = False) -> List[str]:
     """
@@ -28,24 +152,20 @@ def generate_promql_from_question(question: str, namespace: Optional[str], model
     """
     question_lower = question.lower()
     queries = []
-    logger.info("Analyzing question: %s", question)
     
     # Calculate time range duration for dynamic intervals
     duration_seconds = end_ts - start_ts
     duration_hours = duration_seconds / 3600
     
     # Smart interval selection based on time range
-    if duration_hours <= 1:
-        rate_interval = "5m"  # For 1 hour, use 5m intervals (12 data points)
-    elif duration_hours <= 6:
-        rate_interval = "15m"  # For up to 6 hours, use 15m intervals
-    elif duration_hours <= 24:
-        rate_interval = "1h"  # For up to a day, use 1h intervals
-    else:
-        rate_interval = "6h"   # For longer periods, use 6h intervals
+    rate_interval = next(
+        (interval for max_hours, interval in _RATE_INTERVAL_STEPS if duration_hours <= max_hours),
+        _LONG_RANGE_RATE_INTERVAL,
+    )
     
-    logger.info("Time range: %.1fh, interval=%s", duration_hours, rate_interval)
-    logger.info("Scope: %s", FLEET_WIDE_DISPLAY if is_fleet_wide else f"Namespace: {namespace}")
+    if logger.isEnabledFor(logging.INFO):
+        scope = FLEET_WIDE_DISPLAY if is_fleet_wide else f"Namespace: {namespace}"
+        logger.info("Analyzing question: %s (time range: %.1fh, interval=%s, scope: %s)", question, duration_hours, rate_interval, scope)
     
     # STEP 1: Try Enhanced Dynamic System First (TEMPORARILY DISABLED)
     # try:
@@ -78,28 +198,14 @@ def generate_promql_from_question(question: str, namespace: Optional[str], model
     selected_queries, pattern_detected = select_queries_directly(question_lower, namespace, model_name, rate_interval, is_fleet_wide)
     logger.debug("Selected %d direct queries", len(selected_queries))
     
-    # Step 3: Add the selected queries
-    for query in selected_queries:
-        if query and query not in queries:
-            queries.append(query)
+    # Step 3: Add the selected queries (order-preserving dedupe, skipping empties)
+    queries.extend(dict.fromkeys(query for query in selected_queries if query))
     
     # If no specific metrics discovered/selected, add intelligent defaults
     # But DON'T add defaults if user asked a SPECIFIC question that was successfully detected
     if len(queries) == 0 or (len(queries) == 1 and not pattern_detected):
         logger.info("No specific metrics discovered, adding basic defaults")
-        if is_fleet_wide:
-            default_queries = [
-                f'vllm:num_requests_running{{model_name="{model_name}"}}',  # No namespace filter
-                'sum(kube_pod_status_phase{phase="Running"})',  # No namespace filter
-                'avg(DCGM_FI_DEV_GPU_UTIL)'
-            ]
-        else:
-            default_queries = [
-                f'vllm:num_requests_running{{namespace="{namespace}", model_name="{model_name}"}}',
-                f'sum(kube_pod_status_phase{{phase="Running", namespace="{namespace}"}})',
-                f'avg(DCGM_FI_DEV_GPU_UTIL)'
-            ]
-        queries.extend(default_queries)
+        queries.extend(_default_queries(namespace, model_name, is_fleet_wide))
     
     return queries[:6]  # Limit to 6 queries
 
@@ -109,27 +215,10 @@ def extract_time_period_from_question(question: str) -> Optional[str]:
     Extract time periods mentioned in the question and convert to PromQL rate intervals
     Examples: "1 hour" -> "1h", "30 minutes" -> "30m", "1.5 hours" -> "1h30m"
     """
-    import re
-    
     question_lower = question.lower()
     
-    # Pattern matching for various time formats
-    patterns = [
-        # "1 hour", "2 hours", "1.5 hours" 
-        (r'(\d+(?:\.\d+)?)\s*(?:hour|hr|hrs|hours)', lambda m: f"{int(float(m.group(1)) * 60)}m" if float(m.group(1)) < 1 else f"{int(float(m.group(1)))}h"),
-        
-        # "30 minutes", "45 mins"
-        (r'(\d+(?:\.\d+)?)\s*(?:minute|min|mins|minutes)', lambda m: f"{int(float(m.group(1)))}m"),
-        
-        # "2 days", "1 day" 
-        (r'(\d+(?:\.\d+)?)\s*(?:day|days)', lambda m: f"{int(float(m.group(1)) * 24)}h"),
-        
-        # "1h", "30m", "2d" (already in PromQL format)
-        (r'(\d+(?:\.\d+)?[hdm])', lambda m: m.group(1)),
-    ]
-    
-    for pattern, converter in patterns:
-        match = re.search(pattern, question_lower)
+    for pattern, converter in _TIME_PERIOD_PATTERNS:
+        match = pattern.search(question_lower)
         if match:
             try:
                 result = converter(match)
@@ -145,26 +234,46 @@ def select_queries_directly(question: str, namespace: Optional[str], model_name:
     """
     Direct pattern matching for reliable metric selection - simple and effective approach
     """
-    queries = []
     question_lower = question.lower()
-    pattern_detected = False  # Track if we successfully detect a specific pattern
-    
+
     # Extract time period from question text for PromQL rate intervals
-    question_rate_interval = extract_time_period_from_question(question_lower) or rate_interval
-    logger.debug("Using rate interval: %s (from question: %s)", question_rate_interval, extract_time_period_from_question(question_lower) is not None)
+    extracted_interval = extract_time_period_from_question(question_lower)
+    question_rate_interval = extracted_interval or rate_interval
+    logger.debug("Using rate interval: %s (from question: %s)", question_rate_interval, extracted_interval is not None)
+
+    queries, pattern_detected, category = _select_queries_cached(
+        question_lower, namespace, model_name, question_rate_interval, is_fleet_wide
+    )
+
+    # Logging lives here rather than in the cached body so it runs on every call
+    if pattern_detected:
+        logger.debug("Detected: %s question", _QUESTION_CATEGORY_LABELS[category])
+        if category == "pod" and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Detected pod phase: %s", _detect_pod_phase(question_lower))
+    else:
+        logger.info("No specific pattern detected, using intelligent defaults")
+    logger.debug("Generated %d queries: %s", len(queries), list(queries))
+
+    return list(queries), pattern_detected
+
+
+@functools.lru_cache(maxsize=1024)
+def _select_queries_cached(question_lower: str, namespace: Optional[str], model_name: str, rate_interval: str, is_fleet_wide: bool) -> Tuple[Tuple[str, ...], bool, Optional[str]]:
+    """
+    Memoized body of select_queries_directly. The output only depends on the
+    lowered question, scope and rate interval, so repeated dashboard questions
+    skip the classification and regex work entirely. Kept free of logging so
+    cache hits and misses log the same; the caller does the logging.
+    """
+    queries = []
+    pattern_detected = False  # Track if we successfully detect a specific pattern
     
-    # Helper function for clean label construction
-    def get_vllm_labels():
-        """Generate labels for vLLM metrics"""
-        if is_fleet_wide:
-            return f'{{model_name="{model_name}"}}' if model_name else ""
-        else:
-            return f'{{namespace="{namespace}", model_name="{model_name}"}}' if model_name else f'{{namespace="{namespace}"}}'
+    # Single scan over the question; the highest-priority category wins
+    category = _detect_question_category(question_lower)
     
     # === ALERTS (HIGH PRIORITY) ===
     
-    if any(word in question_lower for word in ["alert", "alerts", "firing", "warning", "critical", "problem", "issue"]):
-        logger.debug("Detected: Alerts question")
+    if category == "alert":
         pattern_detected = True
         if is_fleet_wide:
             queries.append(f'ALERTS{{alertstate="firing"}}')  # No namespace filter for fleet-wide
@@ -174,36 +283,32 @@ def select_queries_directly(question: str, namespace: Optional[str], model_name:
     # === vLLM METRICS ===
     
     # Latency patterns
-    elif any(word in question_lower for word in ["latency", "p95", "p99", "percentile", "response time", "slow", "fast"]):
-        logger.debug("Detected: Latency question")
+    elif category == "latency":
         pattern_detected = True
         # Use _count metric as user specifically requested
-        labels = get_vllm_labels()
-        queries.append(f"rate(vllm:e2e_request_latency_seconds_count{labels}[{question_rate_interval}])")
+        labels = _vllm_label_selector(namespace, model_name, is_fleet_wide)
+        queries.append(f"rate(vllm:e2e_request_latency_seconds_count{labels}[{rate_interval}])")
     
     # Request patterns (specifically for vLLM requests, not Kubernetes pods)
-    elif any(word in question_lower for word in ["vllm request", "model request", "inference request", "llm request"]):
-        logger.debug("Detected: vLLM Request question")
+    elif category == "vllm_request":
         pattern_detected = True
-        labels = get_vllm_labels()
+        labels = _vllm_label_selector(namespace, model_name, is_fleet_wide)
         queries.append(f"vllm:num_requests_running{labels}")
     
     # Token patterns
-    elif any(word in question_lower for word in ["token", "tokens", "prompt", "generation", "output"]):
-        logger.debug("Detected: Token question")
+    elif category == "token":
         pattern_detected = True
-        labels = get_vllm_labels()
+        labels = _vllm_label_selector(namespace, model_name, is_fleet_wide)
         if "prompt" in question_lower:
-            queries.append(f"sum(rate(vllm:request_prompt_tokens_created{labels}[{question_rate_interval}]))")
+            queries.append(f"sum(rate(vllm:request_prompt_tokens_created{labels}[{rate_interval}]))")
         elif "output" in question_lower or "generation" in question_lower:
-            queries.append(f"sum(rate(vllm:request_generation_tokens_created{labels}[{question_rate_interval}]))")
+            queries.append(f"sum(rate(vllm:request_generation_tokens_created{labels}[{rate_interval}]))")
         else:
-            queries.append(f"sum(rate(vllm:request_prompt_tokens_created{labels}[{question_rate_interval}]))")
+            queries.append(f"sum(rate(vllm:request_prompt_tokens_created{labels}[{rate_interval}]))")
     
     # === GPU METRICS ===
     
-    elif any(word in question_lower for word in ["gpu", "temperature", "utilization", "power"]):
-        logger.debug("Detected: GPU question")
+    elif category == "gpu":
         pattern_detected = True
         if "temperature" in question_lower:
             queries.append("avg(DCGM_FI_DEV_GPU_TEMP)")
@@ -217,23 +322,10 @@ def select_queries_directly(question: str, namespace: Optional[str], model_name:
     
     # === KUBERNETES/OPENSHIFT METRICS ===
     
-    elif any(word in question_lower for word in ["pod", "pods", "number of pods", "how many pods"]):
-        logger.debug("Detected: Pod question")
+    elif category == "pod":
         pattern_detected = True
         
-        # Enhanced pod phase detection
-        detected_phase = "Running"  # default
-        
-        if any(word in question_lower for word in ["running", "active", "up", "healthy"]):
-            detected_phase = "Running"
-        elif any(word in question_lower for word in ["failed", "failing", "crashed", "error", "broken"]):
-            detected_phase = "Failed"
-        elif any(word in question_lower for word in ["pending", "waiting", "queued", "starting"]):
-            detected_phase = "Pending"
-        elif any(word in question_lower for word in ["succeeded", "completed", "finished"]):
-            detected_phase = "Succeeded"
-        
-        logger.debug("Detected pod phase: %s", detected_phase)
+        detected_phase = _detect_pod_phase(question_lower)
         
         if is_fleet_wide:
             queries.append(f'sum(kube_pod_status_phase{{phase="{detected_phase}"}})')
@@ -241,8 +333,7 @@ def select_queries_directly(question: str, namespace: Optional[str], model_name:
             queries.append(f'sum(kube_pod_status_phase{{phase="{detected_phase}", namespace="{namespace}"}})')
     
     # Deployment patterns
-    elif any(word in question_lower for word in ["deployment", "deployments", "deploy"]):
-        logger.debug("Detected: Deployment question")
+    elif category == "deployment":
         pattern_detected = True
         if is_fleet_wide:
             queries.append("count(kube_deployment_status_replicas)")
@@ -250,8 +341,7 @@ def select_queries_directly(question: str, namespace: Optional[str], model_name:
             queries.append(f'count(kube_deployment_status_replicas{{namespace="{namespace}"}})')
     
     # Service patterns
-    elif any(word in question_lower for word in ["service", "services", "svc"]):
-        logger.debug("Detected: Service question")
+    elif category == "service":
         pattern_detected = True
         if is_fleet_wide:
             queries.append("count(kube_service_info)")
@@ -259,59 +349,41 @@ def select_queries_directly(question: str, namespace: Optional[str], model_name:
             queries.append(f'count(kube_service_info{{namespace="{namespace}"}})')
     
     # Node patterns
-    elif any(word in question_lower for word in ["node", "nodes"]):
-        logger.debug("Detected: Node question")
+    elif category == "node":
         pattern_detected = True
         queries.append("count(kube_node_status_condition{condition='Ready',status='true'})")
     
     # === NETWORK METRICS ===
     
-    elif any(word in question_lower for word in ["network", "bandwidth", "traffic", "connection"]):
-        logger.debug("Detected: Network question")
+    elif category == "network":
         pattern_detected = True
         queries.append("rate(container_network_receive_bytes_total[5m])")
     
     # === MEMORY METRICS ===
     
-    elif any(word in question_lower for word in ["memory", "mem", "ram"]):
-        logger.debug("Detected: Memory question")
+    elif category == "memory":
         pattern_detected = True
         queries.append("container_memory_usage_bytes")
     
     # === CPU METRICS ===
     
-    elif any(word in question_lower for word in ["cpu", "processor"]):
-        logger.debug("Detected: CPU question")
+    elif category == "cpu":
         pattern_detected = True
         queries.append("rate(container_cpu_usage_seconds_total[5m])")
     
     # === STORAGE METRICS ===
     
-    elif any(word in question_lower for word in ["storage", "disk", "volume", "persistent"]):
-        logger.debug("Detected: Storage question")
+    elif category == "storage":
         pattern_detected = True
         queries.append("kubelet_volume_stats_used_bytes")
     
     # === GENERIC/UNKNOWN PATTERNS ===
     
     else:
-        logger.info("No specific pattern detected, using intelligent defaults")
         # Add some intelligent defaults based on the namespace
-        if is_fleet_wide:
-            queries.extend([
-                f'vllm:num_requests_running{{model_name="{model_name}"}}',  # vLLM requests
-                'sum(kube_pod_status_phase{phase="Running"})',  # Running pods
-                'avg(DCGM_FI_DEV_GPU_UTIL)'  # GPU utilization
-            ])
-        else:
-            queries.extend([
-                f'vllm:num_requests_running{{namespace="{namespace}", model_name="{model_name}"}}',  # vLLM requests
-                f'sum(kube_pod_status_phase{{phase="Running", namespace="{namespace}"}})',  # Running pods
-                f'avg(DCGM_FI_DEV_GPU_UTIL)'  # GPU utilization
-            ])
-    
-    logger.debug("Generated %d queries: %s", len(queries), queries)
-    return queries, pattern_detected
+        queries.extend(_default_queries(namespace, model_name, is_fleet_wide))
+    
+    return tuple(queries), pattern_detected, category
 
 
 def discover_available_metrics_from_thanos(namespace: Optional[str], model_name: str, is_fleet_wide: bool) -> List[Dict[str, Any]]:
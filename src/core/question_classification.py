@@ -9,6 +9,8 @@ import re
 from typing import Dict, Any, List, Optional
 from enum import Enum
 
+from .regex_utils import compile_ranked, first_ranked_match
+
 
 class QuestionType(Enum):
     """Enumeration of different question types for better query classification."""
@@ -82,11 +84,10 @@ class QuestionClassifier:
         Returns:
             QuestionType: The classified question type
         """
-        question_lower = question.lower()
-
+        # Patterns are matched case-insensitively, so no lowered copy is needed
         for question_type, patterns in cls.QUESTION_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, question_lower, re.IGNORECASE):
+                if re.search(pattern, question, re.IGNORECASE):
                     return question_type
 
         return QuestionType.GENERAL
@@ -103,7 +104,6 @@ class QuestionClassifier:
         Returns:
             float: Confidence score between 0.0 and 1.0
         """
-        question_lower = question.lower()
         patterns = cls.QUESTION_PATTERNS.get(question_type, [])
         
         if not patterns:
@@ -111,7 +111,7 @@ class QuestionClassifier:
         
         matches = 0
         for pattern in patterns:
-            if re.search(pattern, question_lower, re.IGNORECASE):
+            if re.search(pattern, question, re.IGNORECASE):
                 matches += 1
         
         return min(matches / len(patterns), 1.0)
@@ -202,11 +202,9 @@ class TempoQuestionClassifier(QuestionClassifier):
         Returns:
             str: The appropriate TraceQL query
         """
-        question_lower = question.lower()
-
         if question_type == QuestionType.ERROR_TRACES:
             return cls.QUERY_ERROR_TRACES
-        elif question_type == QuestionType.SLOW_TRACES and "fastest" not in question_lower:
+        elif question_type == QuestionType.SLOW_TRACES and "fastest" not in question.lower():
             return cls.QUERY_SLOW_TRACES
         else:
             # Default query for FAST_TRACES, SERVICE_ACTIVITY, DETAILED_ANALYSIS, and GENERAL
@@ -255,6 +253,13 @@ class TraceErrorDetector:
         r"http[:\s]*[45]\d{2}",  # HTTP 4xx/5xx status codes
     ]
 
+    # All error indicators as one alternation, for yes/no checks in a single pass
+    _ANY_ERROR_RE = re.compile("|".join(f"(?:{pattern})" for pattern in ERROR_PATTERNS), re.IGNORECASE)
+
+    # Same patterns ranked in list order, to find the first one present in the trace
+    _RANKED_ERROR_RE = compile_ranked(ERROR_PATTERNS, re.IGNORECASE)
+    _HTTP_STATUS_RE = re.compile(r"http[:\s]*(\d{3})", re.IGNORECASE)
+
     @classmethod
     def is_error_trace(cls, trace: Dict[str, Any]) -> bool:
         """
@@ -266,13 +271,7 @@ class TraceErrorDetector:
         Returns:
             bool: True if trace appears to contain errors
         """
-        trace_str = str(trace).lower()
-
-        for pattern in cls.ERROR_PATTERNS:
-            if re.search(pattern, trace_str, re.IGNORECASE):
-                return True
-
-        return False
+        return cls._ANY_ERROR_RE.search(str(trace)) is not None
 
     @classmethod
     def extract_error_details(cls, trace: Dict[str, Any]) -> Dict[str, Any]:
@@ -285,7 +284,8 @@ class TraceErrorDetector:
         Returns:
             Dict containing error details
         """
-        trace_str = str(trace).lower()
+        # The patterns are case-insensitive, so the trace text is never lowered
+        trace_str = str(trace)
         error_details = {
             "has_error": False,
             "error_type": None,
@@ -293,17 +293,16 @@ class TraceErrorDetector:
             "status_code": None
         }
 
-        for pattern in cls.ERROR_PATTERNS:
-            match = re.search(pattern, trace_str, re.IGNORECASE)
-            if match:
-                error_details["has_error"] = True
-                error_details["error_type"] = pattern
-                error_details["error_message"] = match.group(0)
-                
-                # Extract HTTP status codes
-                status_match = re.search(r"http[:\s]*(\d{3})", trace_str)
-                if status_match:
-                    error_details["status_code"] = int(status_match.group(1))
-                break
+        ranked = first_ranked_match(cls._RANKED_ERROR_RE, trace_str)
+        if ranked:
+            rank, match = ranked
+            error_details["has_error"] = True
+            error_details["error_type"] = cls.ERROR_PATTERNS[rank]
+            error_details["error_message"] = match.group(match.lastgroup).lower()
+
+            # Extract HTTP status codes
+            status_match = cls._HTTP_STATUS_RE.search(trace_str)
+            if status_match:
+                error_details["status_code"] = int(status_match.group(1))
 
         return error_details
@@ -0,0 +1,51 @@
+"""
+Shared regex helpers for priority-ordered pattern matching.
+
+Several classifiers check a list of patterns in priority order and report the
+first one that appears anywhere in the text. These helpers do that with one
+compiled regex and a single scan instead of one search per pattern.
+"""
+
+import re
+from typing import Optional, Sequence, Tuple
+
+
+def compile_ranked(patterns: Sequence[str], flags: int = 0) -> "re.Pattern[str]":
+    """
+    Compile patterns, given highest priority first, into one ranked regex.
+
+    Each pattern becomes a named group ``r<rank>`` inside a lookahead. The
+    lookahead is zero-width, so finditer tries every position and reports
+    overlapping matches too; first_ranked_match then keeps the lowest rank.
+
+    Args:
+        patterns: Regex sources in priority order
+        flags: re flags applied to the whole regex
+
+    Returns:
+        Compiled regex for use with first_ranked_match
+    """
+    alternation = "|".join(f"(?P<r{rank}>{pattern})" for rank, pattern in enumerate(patterns))
+    return re.compile(f"(?={alternation})", flags)
+
+
+def first_ranked_match(regex: "re.Pattern[str]", text: str) -> Optional[Tuple[int, "re.Match[str]"]]:
+    """
+    Find the highest-priority pattern of a compile_ranked regex in text.
+
+    Args:
+        regex: Regex built by compile_ranked
+        text: Text to scan
+
+    Returns:
+        (rank, match) for the matching pattern with the lowest rank, or None.
+        The match is zero-width; use match.group(match.lastgroup) for the text.
+    """
+    best = None
+    for match in regex.finditer(text):
+        rank = int(match.lastgroup[1:])
+        if best is None or rank < best[0]:
+            best = (rank, match)
+            if rank == 0:
+                break
+    return best
@@ -5,22 +5,29 @@ This module contains the core business logic for querying Tempo traces,
 moving the query logic from the tempo tools to a centralized service.
 """
 
+import asyncio
 import re
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 
 from .http_client import TempoClient
 from .config import (
     TEMPO_URL, TEMPO_TENANT_ID, 
-    MAX_PER_SERVICE_LIMIT, DEFAULT_QUERY_LIMIT, REQUEST_TIMEOUT_SECONDS
+    MAX_PER_SERVICE_LIMIT, DEFAULT_QUERY_LIMIT, REQUEST_TIMEOUT_SECONDS, MAX_CONCURRENT_SERVICE_QUERIES,
+    TEMPO_QUERY_CACHE_MAXSIZE, TEMPO_QUERY_CACHE_TTL_SECONDS, TEMPO_SERVICES_CACHE_TTL_SECONDS
 )
 from .models import QueryResponse, TraceDetailsResponse
 from .error_handling import TempoErrorClassifier
-from .time_utils import convert_duration_to_milliseconds
+from .time_utils import convert_duration_to_milliseconds, iso_to_unix_seconds
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Duration filter in a TraceQL query, e.g. "duration>5s" (unit defaults to seconds)
+_DURATION_FILTER_RE = re.compile(r'duration>(\d+)([smh]?)')
+
 
 class TempoQueryService:
     """Centralized service for Tempo trace queries."""
@@ -29,57 +36,68 @@ class TempoQueryService:
     MAX_PER_SERVICE_LIMIT = MAX_PER_SERVICE_LIMIT
     DEFAULT_QUERY_LIMIT = DEFAULT_QUERY_LIMIT
     REQUEST_TIMEOUT_SECONDS = REQUEST_TIMEOUT_SECONDS
+    MAX_CONCURRENT_SERVICE_QUERIES = MAX_CONCURRENT_SERVICE_QUERIES
     
     def __init__(self):
         """Initialize the Tempo query service."""
         self.client = TempoClient(TEMPO_URL, TEMPO_TENANT_ID, self.REQUEST_TIMEOUT_SECONDS)
+        self._query_cache: "OrderedDict[Tuple[str, int, int, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._services_cache: Optional[Tuple[float, List[str]]] = None
     
     def _extract_root_service(self, trace: Dict[str, Any]) -> str:
         """Extract the root service name from a Jaeger trace."""
-        if "processes" in trace and trace["processes"]:
-            # Get the first process (usually the root service)
-            first_process = list(trace["processes"].values())[0]
+        processes = trace.get("processes")
+        if processes:
+            # Get the first process (usually the root service) without copying all of them
+            first_process = next(iter(processes.values()))
             return first_process.get("serviceName", "unknown")
         return "unknown"
     
-    def _calculate_duration(self, trace: Dict[str, Any]) -> int:
-        """Calculate trace duration in milliseconds from Jaeger trace."""
-        if "spans" in trace and trace["spans"]:
-            # Find the span with the earliest start time and latest end time
-            min_start = float('inf')
-            max_end = 0
-
-            for span in trace["spans"]:
-                start_time = span.get("startTime", 0)
-                duration = span.get("duration", 0)
-                end_time = start_time + duration
-
-                min_start = min(min_start, start_time)
-                max_end = max(max_end, end_time)
-
-            if min_start != float('inf') and max_end > min_start:
-                # Convert from microseconds to milliseconds
-                return int((max_end - min_start) / 1000)
-
-        return 0
+    def _span_timing(self, spans: Optional[List[Dict[str, Any]]]) -> Tuple[int, int]:
+        """
+        Get the duration and start time of a Jaeger trace in a single pass over its spans.
+        
+        Returns:
+            Tuple of (duration in milliseconds, earliest span start time in microseconds)
+        """
+        if not spans:
+            return 0, 0
+        
+        # Find the span with the earliest start time and latest end time
+        min_start = float('inf')
+        max_end = 0
+        for span in spans:
+            start_time = span.get("startTime", 0)
+            end_time = start_time + span.get("duration", 0)
+            if start_time < min_start:
+                min_start = start_time
+            if end_time > max_end:
+                max_end = end_time
+        
+        # Convert from microseconds to milliseconds
+        duration_ms = int((max_end - min_start) / 1000) if max_end > min_start else 0
+        return duration_ms, int(min_start)
     
-    def _get_start_time(self, trace: Dict[str, Any]) -> int:
-        """Get the start time of the trace from Jaeger trace."""
-        if "spans" in trace and trace["spans"]:
-            # Find the earliest start time
-            min_start = float('inf')
-            for span in trace["spans"]:
-                start_time = span.get("startTime", 0)
-                min_start = min(min_start, start_time)
-
-            if min_start != float('inf'):
-                return int(min_start)
-
-        return 0
+    async def aclose(self) -> None:
+        """Close the underlying Tempo client's pooled connections."""
+        await self.client.aclose()
     
     async def get_available_services(self) -> List[str]:
-        """Get list of available services from Tempo/Jaeger."""
-        return await self.client.get_services()
+        """
+        Get list of available services from Tempo/Jaeger.
+        
+        Non-empty service lists are cached for TEMPO_SERVICES_CACHE_TTL_SECONDS,
+        since every wildcard query starts with service discovery.
+        """
+        cached = self._services_cache
+        if cached is not None and time.monotonic() - cached[0] < TEMPO_SERVICES_CACHE_TTL_SECONDS:
+            return list(cached[1])
+        
+        services = await self.client.get_services()
+        if services and TEMPO_SERVICES_CACHE_TTL_SECONDS > 0:
+            self._services_cache = (time.monotonic(), list(services))
+        return services
     
     async def _query_single_service(self, params: Dict[str, Any], query: str, 
                                   start_time: str, end_time: str, duration_filter: Optional[int]) -> Dict[str, Any]:
@@ -89,22 +107,31 @@ class TempoQueryService:
             
             # Convert Jaeger format to our expected format
             traces = []
-            if "data" in response and response["data"]:
-                for trace in response["data"]:
+            data = response.get("data")
+            if data:
+                # Bind per-trace helpers once for the loop
+                extract_root_service = self._extract_root_service
+                span_timing = self._span_timing
+                append_trace = traces.append
+
+                for trace in data:
+                    spans = trace.get("spans")
+                    duration_ms, trace_start = span_timing(spans)
+
+                    # Apply duration filter if specified, before building the rest of the trace info
+                    if duration_filter is not None and duration_ms < duration_filter:
+                        continue
+
                     # Extract basic trace info from Jaeger format
-                    trace_info = {
+                    append_trace({
                         "traceID": trace.get("traceID", ""),
-                        "rootServiceName": self._extract_root_service(trace),
-                        "durationMs": self._calculate_duration(trace),
-                        "spanCount": len(trace.get("spans", [])),
-                        "startTime": self._get_start_time(trace)
-                    }
+                        "rootServiceName": extract_root_service(trace),
+                        "durationMs": duration_ms,
+                        "spanCount": len(spans) if spans else 0,
+                        "startTime": trace_start
+                    })
 
-                    # Apply duration filter if specified
-                    if duration_filter is None or trace_info["durationMs"] >= duration_filter:
-                        traces.append(trace_info)
-
-            logger.info(f"Query results: {len(traces)} traces after filtering (duration_filter: {duration_filter}ms)")
+            logger.info("Query results: %s traces after filtering (duration_filter: %sms)", len(traces), duration_filter)
             
             return QueryResponse(
                 success=True,
@@ -112,7 +139,7 @@ class TempoQueryService:
                 traces=traces,
                 total=len(traces),
                 time_range=f"{start_time} to {end_time}",
-                api_endpoint=f"{self.client.base_url}/api/traces/v1/{self.client.tenant_id}/api/traces",
+                api_endpoint=self.client.traces_url,
                 service_queried=params.get("service", "unknown"),
                 duration_filter_ms=duration_filter
             ).to_dict()
@@ -137,27 +164,33 @@ class TempoQueryService:
                 error="No services available or could not retrieve service list"
             ).to_dict()
 
-        logger.info(f"Querying all {len(available_services)} services for wildcard query")
+        logger.info("Querying all %s services for wildcard query", len(available_services))
 
         all_traces = []
         successful_services = []
         failed_services = []
 
-        # Query each service
-        for service in available_services:
+        # Query all services concurrently (bounded), keeping results in service order
+        semaphore = asyncio.Semaphore(max(1, self.MAX_CONCURRENT_SERVICE_QUERIES))
+        per_service_limit = min(limit, self.MAX_PER_SERVICE_LIMIT)
+
+        async def query_service(service: str) -> Dict[str, Any]:
             service_params = params.copy()
             service_params["service"] = service
-            service_params["limit"] = min(limit, self.MAX_PER_SERVICE_LIMIT)
+            service_params["limit"] = per_service_limit
+            async with semaphore:
+                return await self._query_single_service(service_params, query, start_time, end_time, duration_filter)
 
-            result = await self._query_single_service(service_params, query, start_time, end_time, duration_filter)
+        results = await asyncio.gather(*(query_service(service) for service in available_services))
 
+        for service, result in zip(available_services, results, strict=True):
             if result["success"]:
                 all_traces.extend(result["traces"])
                 successful_services.append(service)
-                logger.info(f"Service '{service}': {len(result['traces'])} traces")
+                logger.info("Service '%s': %s traces", service, len(result['traces']))
             else:
                 failed_services.append(service)
-                logger.warning(f"Service '{service}': {result['error']}")
+                logger.warning("Service '%s': %s", service, result['error'])
 
         # Sort all traces by duration (for fastest/slowest analysis)
         all_traces.sort(key=lambda x: x.get("durationMs", 0), reverse=True)
@@ -166,9 +199,9 @@ class TempoQueryService:
         if len(all_traces) > limit:
             all_traces = all_traces[:limit]
 
-        logger.info(f"Combined results: {len(all_traces)} traces from {len(successful_services)} services")
+        logger.info("Combined results: %s traces from %s services", len(all_traces), len(successful_services))
         if failed_services:
-            logger.warning(f"Failed to query {len(failed_services)} services: {failed_services}")
+            logger.warning("Failed to query %s services: %s", len(failed_services), failed_services)
 
         return QueryResponse(
             success=True,
@@ -176,7 +209,7 @@ class TempoQueryService:
             traces=all_traces,
             total=len(all_traces),
             time_range=f"{start_time} to {end_time}",
-            api_endpoint=f"{self.client.base_url}/api/traces/v1/{self.client.tenant_id}/api/traces",
+            api_endpoint=self.client.traces_url,
             service_queried=f"all services ({len(successful_services)}/{len(available_services)})",
             duration_filter_ms=duration_filter,
             services_queried=successful_services,
@@ -212,7 +245,7 @@ class TempoQueryService:
 
         # Parse duration filter
         if "duration>" in query:
-            duration_match = re.search(r'duration>(\d+)([smh]?)', query)
+            duration_match = _DURATION_FILTER_RE.search(query)
             if duration_match:
                 duration_value = int(duration_match.group(1))
                 duration_unit = duration_match.group(2) or 's'
@@ -222,11 +255,75 @@ class TempoQueryService:
 
         return service_name, duration_filter
     
+    @staticmethod
+    def _query_cache_key(query: str, start_time: str, end_time: str, limit: int) -> Optional[Tuple[str, int, int, int]]:
+        """
+        Cache key for a query, or None when the query should not be cached.
+
+        Callers build their windows from "now", so the bounds are rounded down
+        to TTL-sized buckets; windows asked for within one TTL share an entry.
+        """
+        if TEMPO_QUERY_CACHE_TTL_SECONDS <= 0 or TEMPO_QUERY_CACHE_MAXSIZE <= 0:
+            return None
+        try:
+            start_s = iso_to_unix_seconds(start_time)
+            end_s = iso_to_unix_seconds(end_time)
+        except (AttributeError, TypeError, ValueError):
+            # Invalid timestamps are reported by _execute_query; nothing to cache
+            return None
+        bucket = TEMPO_QUERY_CACHE_TTL_SECONDS
+        return (query, start_s // bucket, end_s // bucket, limit)
+
+    def _get_cached_query(self, key: Tuple[str, int, int, int]) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached query result for key, if any."""
+        if TEMPO_QUERY_CACHE_TTL_SECONDS <= 0 or TEMPO_QUERY_CACHE_MAXSIZE <= 0:
+            return None
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at >= TEMPO_QUERY_CACHE_TTL_SECONDS:
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+            return self._copy_query_result(result)
+
+    def _store_cached_query(self, key: Tuple[str, int, int, int], result: Dict[str, Any]) -> None:
+        """Cache a successful query result, evicting the least recently used entries."""
+        if TEMPO_QUERY_CACHE_TTL_SECONDS <= 0 or TEMPO_QUERY_CACHE_MAXSIZE <= 0:
+            return
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), self._copy_query_result(result))
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > TEMPO_QUERY_CACHE_MAXSIZE:
+                self._query_cache.popitem(last=False)
+
+    @staticmethod
+    def _copy_query_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a query result so callers cannot modify a cached entry in place."""
+        return {
+            field: [dict(item) if isinstance(item, dict) else item for item in value]
+            if isinstance(value, list) else value
+            for field, value in result.items()
+        }
+
+    def clear_query_cache(self) -> None:
+        """Drop all cached query results and the cached service list."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+        self._services_cache = None
+
     async def query_traces(self, query: str, start_time: str, end_time: str, 
                           limit: int = DEFAULT_QUERY_LIMIT) -> Dict[str, Any]:
         """
         Query traces from Tempo using TraceQL syntax.
         
+        Successful results are cached for TEMPO_QUERY_CACHE_TTL_SECONDS, so
+        dashboard refreshes and chat follow-ups over the same window skip Tempo.
+        The window bounds are keyed in TTL-sized buckets, so a repeated
+        "last N hours" question within one TTL reuses the earlier result.
+        
         Args:
             query: TraceQL query string
             start_time: Start time in ISO 8601 format
@@ -236,10 +333,27 @@ class TempoQueryService:
         Returns:
             Query result dictionary
         """
+        cache_key = self._query_cache_key(query, start_time, end_time, limit)
+        if cache_key is not None:
+            cached = self._get_cached_query(cache_key)
+            if cached is not None:
+                logger.info("Tempo query cache hit for '%s' (%s to %s)", query, start_time, end_time)
+                cached["time_range"] = f"{start_time} to {end_time}"
+                return cached
+
+        result = await self._execute_query(query, start_time, end_time, limit)
+        # Wildcard queries report success even when some services failed;
+        # only cache complete results so an outage is not replayed for the TTL
+        if cache_key is not None and result.get("success") and not result.get("failed_services"):
+            self._store_cached_query(cache_key, result)
+        return result
+
+    async def _execute_query(self, query: str, start_time: str, end_time: str, limit: int) -> Dict[str, Any]:
+        """Run a TraceQL query against Tempo without consulting the cache."""
         try:
             # Convert times to Unix timestamps
-            start_ts = int(datetime.fromisoformat(start_time.replace('Z', '+00:00')).timestamp())
-            end_ts = int(datetime.fromisoformat(end_time.replace('Z', '+00:00')).timestamp())
+            start_ts = iso_to_unix_seconds(start_time)
+            end_ts = iso_to_unix_seconds(end_time)
 
             # Parse TraceQL query
             service_name, duration_filter = self._parse_traceql_query(query)
@@ -6,9 +6,50 @@ the observability summarizer for parsing user questions and
 converting time ranges to appropriate formats.
 """
 
+import functools
 import re
 from typing import Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from .regex_utils import compile_ranked, first_ranked_match
+
+
+# Time range phrases in priority order, mapped to their standardized range
+_TIME_RANGE_PHRASES = (
+    (("last 24 hours", "last 24h", "yesterday"), "last 24h"),
+    (("last week", "last 7 days"), "last 7d"),
+    (("last month", "last 30 days"), "last 30d"),
+    (("last 2 hours", "last 2h"), "last 2h"),
+    (("last 6 hours", "last 6h"), "last 6h"),
+    (("last 12 hours", "last 12h"), "last 12h"),
+    (("last hour", "last 1h", "last 1 hour"), "last 1h"),
+    (("last 30 minutes", "last 30m"), "last 30m"),
+    (("last 15 minutes", "last 15m"), "last 15m"),
+    (("last 5 minutes", "last 5m"), "last 5m"),
+    (("today",), "last 24h"),
+    (("this week",), "last 7d"),
+    (("this month",), "last 30d"),
+)
+
+_TIME_RANGE_RE = compile_ranked(
+    ["|".join(map(re.escape, phrases)) for phrases, _ in _TIME_RANGE_PHRASES]
+)
+
+
+# Lookback window for each standardized time range
+_TIME_RANGE_DELTAS = {
+    "last 24h": timedelta(hours=24),
+    "last 7d": timedelta(days=7),
+    "last 30d": timedelta(days=30),
+    "last 2h": timedelta(hours=2),
+    "last 6h": timedelta(hours=6),
+    "last 12h": timedelta(hours=12),
+    "last 1h": timedelta(hours=1),
+    "last 30m": timedelta(minutes=30),
+    "last 15m": timedelta(minutes=15),
+    "last 5m": timedelta(minutes=5),
+}
+_DEFAULT_TIME_RANGE_DELTA = _TIME_RANGE_DELTAS["last 24h"]
 
 
 def extract_time_range_from_question(question: str) -> str:
@@ -24,38 +65,12 @@ def extract_time_range_from_question(question: str) -> str:
     Returns:
         Time range string in a standardized format
     """
-    question_lower = question.lower()
-
-    # Check for specific time ranges
-    if "last 24 hours" in question_lower or "last 24h" in question_lower or "yesterday" in question_lower:
-        return "last 24h"
-    elif "last week" in question_lower or "last 7 days" in question_lower:
-        return "last 7d"
-    elif "last month" in question_lower or "last 30 days" in question_lower:
-        return "last 30d"
-    elif "last 2 hours" in question_lower or "last 2h" in question_lower:
-        return "last 2h"
-    elif "last 6 hours" in question_lower or "last 6h" in question_lower:
-        return "last 6h"
-    elif "last 12 hours" in question_lower or "last 12h" in question_lower:
-        return "last 12h"
-    elif "last hour" in question_lower or "last 1h" in question_lower or "last 1 hour" in question_lower:
-        return "last 1h"
-    elif "last 30 minutes" in question_lower or "last 30m" in question_lower:
-        return "last 30m"
-    elif "last 15 minutes" in question_lower or "last 15m" in question_lower:
-        return "last 15m"
-    elif "last 5 minutes" in question_lower or "last 5m" in question_lower:
-        return "last 5m"
-    elif "today" in question_lower:
-        return "last 24h"
-    elif "this week" in question_lower:
-        return "last 7d"
-    elif "this month" in question_lower:
-        return "last 30d"
-    else:
-        # Default to last 24 hours if no specific time range found
-        return "last 24h"
+    ranked = first_ranked_match(_TIME_RANGE_RE, question.lower())
+    if ranked:
+        return _TIME_RANGE_PHRASES[ranked[0]][1]
+
+    # Default to last 24 hours if no specific time range found
+    return "last 24h"
 
 
 def convert_time_range_to_iso(time_range: str) -> Tuple[str, str]:
@@ -68,33 +83,34 @@ def convert_time_range_to_iso(time_range: str) -> Tuple[str, str]:
     Returns:
         Tuple of (start_time_iso, end_time_iso)
     """
-    now = datetime.now()
+    # Timestamps carry a "Z" suffix, so they must be taken in UTC rather than local time
+    now = datetime.now(timezone.utc)
+    # Unknown ranges default to the last 24 hours
+    start_time = now - _TIME_RANGE_DELTAS.get(time_range, _DEFAULT_TIME_RANGE_DELTA)
     
-    if time_range == "last 24h":
-        start_time = now - timedelta(hours=24)
-    elif time_range == "last 7d":
-        start_time = now - timedelta(days=7)
-    elif time_range == "last 30d":
-        start_time = now - timedelta(days=30)
-    elif time_range == "last 2h":
-        start_time = now - timedelta(hours=2)
-    elif time_range == "last 6h":
-        start_time = now - timedelta(hours=6)
-    elif time_range == "last 12h":
-        start_time = now - timedelta(hours=12)
-    elif time_range == "last 1h":
-        start_time = now - timedelta(hours=1)
-    elif time_range == "last 30m":
-        start_time = now - timedelta(minutes=30)
-    elif time_range == "last 15m":
-        start_time = now - timedelta(minutes=15)
-    elif time_range == "last 5m":
-        start_time = now - timedelta(minutes=5)
-    else:
-        # Default to last 24 hours
-        start_time = now - timedelta(hours=24)
+    return _to_utc_iso(start_time), _to_utc_iso(now)
+
+
+def _to_utc_iso(dt: datetime) -> str:
+    """Format an aware UTC datetime as ISO 8601 with a trailing "Z"."""
+    return dt.replace(tzinfo=None).isoformat() + "Z"
+
+
+@functools.lru_cache(maxsize=256)
+def iso_to_unix_seconds(iso_time: str) -> int:
+    """
+    Convert an ISO 8601 timestamp to Unix seconds.
+    
+    A trailing "Z" is treated as UTC. Results are cached, since chat and
+    dashboard flows reuse the same time window across many queries.
     
-    return start_time.isoformat() + "Z", now.isoformat() + "Z"
+    Args:
+        iso_time: Timestamp such as "2024-01-01T00:00:00Z"
+        
+    Returns:
+        Unix timestamp in whole seconds
+    """
+    return int(datetime.fromisoformat(iso_time.replace('Z', '+00:00')).timestamp())
 
 
 def calculate_duration_ms(trace: dict) -> int:
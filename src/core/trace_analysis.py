@@ -5,7 +5,10 @@ This module provides reusable trace analysis patterns that can be used
 across different observability tools for consistent analysis.
 """
 
-from typing import Dict, List, Any
+import heapq
+from collections import Counter
+from itertools import islice
+from typing import Counter as CounterType, Dict, List, Any
 from dataclasses import dataclass
 
 from common.pylogger import get_python_logger
@@ -15,11 +18,14 @@ from core.question_classification import TraceErrorDetector
 
 logger = get_python_logger()
 
+# Suggest consolidation once more than this many services show up in the results
+_SERVICE_CONSOLIDATION_THRESHOLD = 5
+
 
 @dataclass
 class TraceAnalysisResult:
     """Result of trace analysis containing all analyzed data."""
-    services: Dict[str, int]
+    services: CounterType[str]
     error_traces: List[Dict[str, Any]]
     slow_traces: List[Dict[str, Any]]
     all_traces_with_duration: List[Dict[str, Any]]
@@ -39,7 +45,7 @@ class TraceAnalyzer:
         Returns:
             TraceAnalysisResult with analysis data
         """
-        services = {}
+        services = Counter()
         error_traces = []
         slow_traces = []
         all_traces_with_duration = []
@@ -51,7 +57,7 @@ class TraceAnalyzer:
             duration = calculate_duration_ms(trace)
             
             # Count services
-            services[service_name] = services.get(service_name, 0) + 1
+            services[service_name] += 1
             
             # Store all traces with duration for analysis
             trace_with_duration = trace.copy()
@@ -74,70 +80,70 @@ class TraceAnalyzer:
         )
 
     @staticmethod
-    def generate_service_activity_summary(services: Dict[str, int]) -> str:
+    def generate_service_activity_summary(services: CounterType[str]) -> str:
         """Generate a markdown summary of service activity."""
-        content = ""
+        parts = []
         if services:
-            content += "**Services Activity**:\n"
-            for service, count in sorted(services.items(), key=lambda x: x[1], reverse=True)[:5]:
-                content += f"- {service}: {count} traces\n"
-            content += "\n"
-        return content
+            parts.append("**Services Activity**:\n")
+            for service, count in services.most_common(5):
+                parts.append(f"- {service}: {count} traces\n")
+            parts.append("\n")
+        return "".join(parts)
 
     @staticmethod
     def generate_slow_traces_summary(slow_traces: List[Dict[str, Any]]) -> str:
         """Generate a markdown summary of slow traces."""
-        content = ""
+        parts = []
         if slow_traces:
-            content += f"**⚠️ Performance Issues**: {len(slow_traces)} slow traces found (>1000ms)\n"
-            content += "Slowest traces:\n"
-            top_slow_traces = sorted(slow_traces, key=lambda x: x.get("durationMs", 0), reverse=True)[:3]
+            parts.append(f"**⚠️ Performance Issues**: {len(slow_traces)} slow traces found (>1000ms)\n")
+            parts.append("Slowest traces:\n")
+            top_slow_traces = heapq.nlargest(3, slow_traces, key=lambda x: x.get("durationMs", 0))
             for i, trace in enumerate(top_slow_traces, 1):
                 trace_id = trace.get("traceID", "unknown")
                 service = trace.get("rootServiceName", "unknown")
                 duration = trace.get("durationMs", 0)
-                content += f"{i}. **{service}**: {trace_id} ({duration:.2f}ms)\n"
-            content += "\n"
-        return content
+                parts.append(f"{i}. **{service}**: {trace_id} ({duration:.2f}ms)\n")
+            parts.append("\n")
+        return "".join(parts)
 
     @staticmethod
     def generate_error_traces_summary(error_traces: List[Dict[str, Any]]) -> str:
         """Generate a markdown summary of error traces."""
-        content = ""
+        parts = []
         if error_traces:
-            content += f"**🚨 Error Traces**: {len(error_traces)} error traces found\n"
-            content += "Recent error traces:\n"
-            for trace in error_traces[:3]:
+            parts.append(f"**🚨 Error Traces**: {len(error_traces)} error traces found\n")
+            parts.append("Recent error traces:\n")
+            for trace in islice(error_traces, 3):
                 trace_id = trace.get("traceID", "unknown")
                 service = trace.get("rootServiceName", "unknown")
-                content += f"- {service}: {trace_id}\n"
-            content += "\n"
-        return content
+                parts.append(f"- {service}: {trace_id}\n")
+            parts.append("\n")
+        return "".join(parts)
 
     @staticmethod
     def generate_recommendations(services: Dict[str, int], slow_traces: List[Dict[str, Any]], 
                                error_traces: List[Dict[str, Any]], traces: List[Dict[str, Any]]) -> str:
         """Generate recommendations based on trace analysis."""
-        content = "## 💡 **Recommendations**\n\n"
+        parts = ["## 💡 **Recommendations**\n\n"]
         
         if slow_traces:
-            content += f"- **Investigate slow traces**: {len(slow_traces)} traces took >1 second\n"
-            content += f"- **Slowest trace**: {slow_traces[0]['traceID']} ({slow_traces[0]['durationMs']}ms)\n"
-            content += "- **Get trace details**: Use `get_trace_details_tool` with trace ID\n"
+            parts.append(f"- **Investigate slow traces**: {len(slow_traces)} traces took >1 second\n")
+            parts.append(f"- **Slowest trace**: {slow_traces[0]['traceID']} ({slow_traces[0]['durationMs']}ms)\n")
+            parts.append("- **Get trace details**: Use `get_trace_details_tool` with trace ID\n")
         
         if error_traces:
-            content += f"- **Check error traces**: {len(error_traces)} traces had errors\n"
-            content += f"- **Error trace**: {error_traces[0]['traceID']}\n"
+            parts.append(f"- **Check error traces**: {len(error_traces)} traces had errors\n")
+            parts.append(f"- **Error trace**: {error_traces[0]['traceID']}\n")
         
-        if len(services) > 5:
-            content += f"- **Service consolidation**: Consider consolidating {len(services)} services\n"
+        if len(services) > _SERVICE_CONSOLIDATION_THRESHOLD:
+            parts.append(f"- **Service consolidation**: Consider consolidating {len(services)} services\n")
 
-        content += "- **Query specific traces**: Use `query_tempo_tool` for filtered searches\n"
-        content += "- **Example queries**:\n"
+        parts.append("- **Query specific traces**: Use `query_tempo_tool` for filtered searches\n")
+        parts.append("- **Example queries**:\n")
         if traces:
-            content += f"  - `Get details for trace {traces[0]['traceID']}`\n"
-        content += "  - `Query traces with duration > 5000ms from last week`\n"
-        content += "  - `Show me traces with errors from last week`\n"
-        content += "\n"
+            parts.append(f"  - `Get details for trace {traces[0]['traceID']}`\n")
+        parts.append("  - `Query traces with duration > 5000ms from last week`\n")
+        parts.append("  - `Show me traces with errors from last week`\n")
+        parts.append("\n")
         
-        return content
\ No newline at end of file
+        return "".join(parts)
\ No newline at end of file
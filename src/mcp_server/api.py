@@ -1,11 +1,14 @@
 """FastAPI application setup for Observability MCP Server with report endpoints."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 
 from mcp_server.observability_mcp import ObservabilityMCPServer
 from mcp_server.settings import settings
+from mcp_server.tools.tempo_tools import close_tempo_service
 
 # Import report-related modules with error handling for clearer diagnostics
 try:
@@ -37,8 +40,19 @@ if settings.MCP_TRANSPORT_PROTOCOL == "sse":
 else:
     mcp_app = server.mcp.http_app(path="/mcp")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the MCP lifespan, then close pooled upstream connections on shutdown."""
+    try:
+        async with mcp_app.lifespan(app):
+            yield
+    finally:
+        await close_tempo_service()
+
+
 # Initialize FastAPI with MCP lifespan
-app = FastAPI(lifespan=mcp_app.lifespan)
+app = FastAPI(lifespan=lifespan)
 
 # Optional CORS
 if settings.CORS_ENABLED:
@@ -13,6 +13,7 @@ OpenShift-specific tools live in observability_openshift_tools.py
 
 import json
 import os
+import time
 import pandas as pd
 from typing import Dict, Any, List, Optional
 
@@ -31,8 +32,8 @@ from core.models import AnalyzeRequest
 from core.response_validator import ResponseType
 from core.metrics import NAMESPACE_SCOPED, CLUSTER_WIDE
 from core.config import PROMETHEUS_URL, THANOS_TOKEN, VERIFY_SSL, DEFAULT_TIME_RANGE_DAYS
+from core.time_utils import iso_to_unix_seconds
 import requests
-from datetime import datetime, timedelta
 
 # Import structured logger from MCP server utilities
 from common.pylogger import get_python_logger
@@ -77,19 +78,19 @@ def resolve_time_range(
 
         # 2) ISO datetime strings
         if start_datetime and end_datetime:
-            rs = int(datetime.fromisoformat(start_datetime.replace("Z", "+00:00")).timestamp())
-            re = int(datetime.fromisoformat(end_datetime.replace("Z", "+00:00")).timestamp())
+            rs = iso_to_unix_seconds(start_datetime)
+            re = iso_to_unix_seconds(end_datetime)
             return rs, re
 
         # 3) Default: last DEFAULT_TIME_RANGE_DAYS days
-        now = int(datetime.utcnow().timestamp())
+        now = int(time.time())
         return now - (DEFAULT_TIME_RANGE_DAYS * 24 * 3600), now
     except Exception as e:
         # Log the error for debugging
         logger.error(f"Error in resolve_time_range: {e}")
         logger.error(f"Inputs: time_range={time_range}, start_datetime={start_datetime}, end_datetime={end_datetime}")
         # Safe fallback to default range on any parsing error
-        now = int(datetime.utcnow().timestamp())
+        now = int(time.time())
         return now - (DEFAULT_TIME_RANGE_DAYS * 24 * 3600), now
 
 
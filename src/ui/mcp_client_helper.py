@@ -758,7 +758,7 @@ def parse_analyze_response(response_text: str) -> Dict[str, Any]:
             prompt_lines = []
             for i in range(prompt_start, len(lines)):
                 line = lines[i]
-                if line.strip().startswith("Current Analysis Time:") or line.strip().startswith("METRICS DATA:"):
+                if line.strip().startswith(("Current Analysis Time:", "METRICS DATA:")):
                     break
                 prompt_lines.append(line)
             result["health_prompt"] = '\n'.join(prompt_lines).strip()
@@ -766,7 +766,8 @@ def parse_analyze_response(response_text: str) -> Dict[str, Any]:
         # Find the LLM-generated summary section
         summary_start = -1
         for i, line in enumerate(lines):
-            if line.strip() == "Summary:" or line.strip().startswith("**Performance Summary**"):
+            stripped = line.strip()
+            if stripped == "Summary:" or stripped.startswith("**Performance Summary**"):
                 summary_start = i
                 break
 
@@ -28,7 +28,8 @@ from src.core.models import (
     OpenShiftChatRequest,
     ReportRequest,
     MetricsCalculationRequest,
-    MetricsCalculationResponse
+    MetricsCalculationResponse,
+    QueryResponse
 )
 
 
@@ -339,4 +340,14 @@ class TestModelSerialization:
         
         assert reconstructed.model_name == request.model_name
         assert reconstructed.question == request.question
-        assert reconstructed.namespace == request.namespace 
\ No newline at end of file
+        assert reconstructed.namespace == request.namespace 
+
+    def test_query_response_to_dict_excludes_none(self):
+        """Should drop unset fields and keep trace data as-is"""
+        traces = [{"traceID": "abc123", "spans": []}]
+        response = QueryResponse(success=True, query="service.name=ui", traces=traces, total=1)
+
+        data = response.to_dict()
+
+        assert data == {"success": True, "query": "service.name=ui", "traces": traces, "total": 1}
+        assert data["traces"] is traces
@@ -0,0 +1,170 @@
+"""
+Tests for the centralized HTTP client.
+
+This module tests connection reuse, JSON decoding, token caching and Tempo endpoints in the core http_client module.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch, AsyncMock
+
+import httpx
+
+from src.core.http_client import HTTPClient, TempoClient, _get_ssl_context
+
+
+class TestAsyncClientReuse:
+    """Test pooling of the async httpx client"""
+
+    def test_client_is_reused_within_event_loop(self):
+        """Should hand out the same client for requests on one event loop"""
+        http_client = HTTPClient("http://tempo.example:3200")
+
+        async def get_clients():
+            return http_client._get_async_client(), http_client._get_async_client()
+
+        first, second = asyncio.run(get_clients())
+
+        assert first is second
+
+    def test_client_is_recreated_for_new_event_loop(self):
+        """Should not reuse a client bound to a previous event loop"""
+        http_client = HTTPClient("http://tempo.example:3200")
+
+        async def get_client():
+            return http_client._get_async_client()
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
+        assert first.is_closed
+        assert second.is_closed
+
+    def test_replaced_client_is_closed_on_its_own_loop(self):
+        """Should close a client from a loop that is still running when it is replaced"""
+        http_client = HTTPClient("http://tempo.example:3200")
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            async def get_client():
+                return http_client._get_async_client()
+
+            first = asyncio.run_coroutine_threadsafe(get_client(), loop).result()
+            closer = http_client._async_client_closer
+            second = asyncio.run(get_client())
+            asyncio.run_coroutine_threadsafe(asyncio.wait([closer]), loop).result()
+
+            assert first is not second
+            assert first.is_closed
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def test_aclose_closes_pooled_client(self):
+        """Should close the pooled client and create a fresh one afterwards"""
+        http_client = HTTPClient("http://tempo.example:3200")
+
+        async def use_and_close():
+            client = http_client._get_async_client()
+            await http_client.aclose()
+            return client, http_client._get_async_client()
+
+        closed, fresh = asyncio.run(use_and_close())
+
+        assert closed.is_closed
+        assert fresh is not closed
+
+    def test_ssl_context_is_built_once_per_setting(self):
+        """Should share one SSL context between clients with the same verify setting"""
+        assert _get_ssl_context(True) is _get_ssl_context(True)
+        assert _get_ssl_context(False) is False
+
+
+class TestJsonDecoding:
+    """Test decoding of async JSON responses"""
+
+    def test_large_response_is_decoded_off_the_event_loop(self):
+        """Should decode bodies above LARGE_RESPONSE_BYTES in a worker thread"""
+        http_client = HTTPClient("http://tempo.example:3200")
+        http_client.LARGE_RESPONSE_BYTES = 10
+        response = httpx.Response(200, json={"data": ["ui", "api", "database"]})
+
+        with patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+            result = asyncio.run(http_client._decode_json(response))
+
+        assert result == {"data": ["ui", "api", "database"]}
+        mock_to_thread.assert_called_once()
+
+    def test_small_response_is_decoded_inline(self):
+        """Should decode small bodies directly"""
+        http_client = HTTPClient("http://tempo.example:3200")
+        response = httpx.Response(200, json={"data": []})
+
+        with patch("asyncio.to_thread") as mock_to_thread:
+            result = asyncio.run(http_client._decode_json(response))
+
+        assert result == {"data": []}
+        mock_to_thread.assert_not_called()
+
+
+class TestServiceAccountTokenCache:
+    """Test caching of the service account token"""
+
+    def test_token_is_read_once_within_ttl(self):
+        """Should not re-read the token file on every request"""
+        http_client = HTTPClient("http://tempo.example:3200")
+
+        with patch.object(http_client, "_read_service_account_token", return_value="abc") as mock_read:
+            assert http_client._get_auth_headers() == {"Authorization": "Bearer abc"}
+            assert http_client._get_auth_headers() == {"Authorization": "Bearer abc"}
+
+        assert mock_read.call_count == 1
+
+    @patch("src.core.http_client.SERVICE_ACCOUNT_TOKEN_CACHE_TTL_SECONDS", 0)
+    def test_zero_ttl_disables_token_cache(self):
+        """Should re-read the token on every request when the TTL is 0"""
+        http_client = HTTPClient("http://tempo.example:3200")
+
+        with patch.object(http_client, "_read_service_account_token", return_value="abc") as mock_read:
+            http_client._get_auth_headers()
+            http_client._get_auth_headers()
+
+        assert mock_read.call_count == 2
+
+
+class TestTempoClientEndpoints:
+    """Test the Tempo endpoints built at construction time"""
+
+    def test_requests_use_tenant_endpoints(self):
+        """Should route requests and headers through the configured tenant"""
+        tempo_client = TempoClient("http://tempo.example:3200/", "dev")
+        tempo_client.get_async = AsyncMock(return_value={"data": []})
+
+        with patch.object(tempo_client, "_read_service_account_token", return_value=None):
+            asyncio.run(tempo_client.get_services())
+            asyncio.run(tempo_client.query_traces({"limit": 5}))
+            asyncio.run(tempo_client.get_trace_details("abc123"))
+
+        endpoints = [call.args[0] for call in tempo_client.get_async.await_args_list]
+        assert endpoints == [
+            "/api/traces/v1/dev/api/services",
+            "/api/traces/v1/dev/api/traces",
+            "/api/traces/v1/dev/api/traces/abc123",
+        ]
+        assert tempo_client.traces_url == "http://tempo.example:3200/api/traces/v1/dev/api/traces"
+        headers = tempo_client.get_async.await_args.kwargs["headers"]
+        assert headers == {"X-Scope-OrgID": "dev", "Content-Type": "application/json"}
+        assert headers is not tempo_client._base_tempo_headers
+
+    def test_trace_details_endpoint_allows_braces_in_tenant(self):
+        """Should build the trace details endpoint without treating the tenant as a format string"""
+        tempo_client = TempoClient("http://tempo.example:3200", "{team}")
+        tempo_client.get_async = AsyncMock(return_value={})
+
+        with patch.object(tempo_client, "_read_service_account_token", return_value=None):
+            asyncio.run(tempo_client.get_trace_details("abc123"))
+
+        assert tempo_client.get_async.await_args.args[0] == "/api/traces/v1/{team}/api/traces/abc123"
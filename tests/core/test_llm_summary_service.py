@@ -13,10 +13,19 @@ from datetime import datetime
 from src.core.llm_summary_service import (
     generate_llm_summary,
     extract_alert_info_from_thanos_data,
-    generate_alert_analysis_with_llm
+    generate_alert_analysis_with_llm,
+    clear_llm_summary_cache
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_llm_cache():
+    """Isolate tests from LLM responses cached by earlier tests"""
+    clear_llm_summary_cache()
+    yield
+    clear_llm_summary_cache()
+
+
 class TestGenerateLLMSummary:
     """Test LLM summary generation functionality"""
     
@@ -145,6 +154,95 @@ class TestGenerateLLMSummary:
         # Should return error message
         assert "Error generating summary" in result
 
+    @patch('src.core.llm_summary_service.summarize_with_llm')
+    def test_generate_llm_summary_routes_alert_questions(self, mock_summarize):
+        """Should route alert keywords to alert analysis regardless of case"""
+        mock_summarize.return_value = "### HighCPUUsage\n- Severity: warning\n"
+
+        thanos_data = {
+            "alerts": {
+                "status": "success",
+                "data": {
+                    "result": [
+                        {"metric": {"alertname": "HighCPUUsage", "severity": "warning"}}
+                    ]
+                }
+            }
+        }
+
+        result = generate_llm_summary(
+            question="Are there any CRITICAL issues?",
+            thanos_data=thanos_data,
+            model_id="test-model",
+            api_key="test-key",
+            namespace="test-ns"
+        )
+
+        assert "TOTAL OF 1 ALERT(S) FOUND" in result
+        assert "HighCPUUsage" in result
+
+
+class TestLLMSummaryCache:
+    """Test caching of identical LLM summary requests"""
+
+    THANOS_DATA = {
+        "metric1": {
+            "status": "success",
+            "data": {"result": [{"values": [[1640995200, 50.0]]}]},
+            "promql": "test_metric"
+        }
+    }
+
+    def _summarize(self, model_id="test-model", api_key="test-key"):
+        return generate_llm_summary(
+            question="How is the system performing?",
+            thanos_data=self.THANOS_DATA,
+            model_id=model_id,
+            api_key=api_key,
+            namespace="test-ns"
+        )
+
+    @patch('src.core.llm_summary_service.summarize_with_llm')
+    def test_identical_requests_reuse_response(self, mock_summarize):
+        """Should call the LLM once for repeated identical prompts"""
+        mock_summarize.return_value = "Cached summary response"
+
+        first = self._summarize()
+        second = self._summarize()
+
+        assert first == second
+        mock_summarize.assert_called_once()
+
+    @patch('src.core.llm_summary_service.summarize_with_llm')
+    def test_different_model_is_not_shared(self, mock_summarize):
+        """Should not reuse a response generated by another model"""
+        mock_summarize.return_value = "Summary response"
+
+        self._summarize(model_id="model-a")
+        self._summarize(model_id="model-b")
+
+        assert mock_summarize.call_count == 2
+
+    @patch('src.core.llm_summary_service.summarize_with_llm')
+    def test_empty_response_is_not_cached(self, mock_summarize):
+        """Should retry the LLM when the previous response was empty"""
+        mock_summarize.side_effect = ["", "Recovered summary"]
+
+        assert "Failed to generate summary" in self._summarize()
+        assert "Recovered summary" in self._summarize()
+        assert mock_summarize.call_count == 2
+
+    @patch('src.core.llm_summary_service.LLM_SUMMARY_CACHE_TTL_SECONDS', 0)
+    @patch('src.core.llm_summary_service.summarize_with_llm')
+    def test_cache_disabled_with_zero_ttl(self, mock_summarize):
+        """Should always call the LLM when caching is disabled"""
+        mock_summarize.return_value = "Summary response"
+
+        self._summarize()
+        self._summarize()
+
+        assert mock_summarize.call_count == 2
+
 
 class TestExtractAlertNames:
     """Test alert name extraction functionality"""
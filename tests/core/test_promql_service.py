@@ -264,6 +264,40 @@ class TestSelectQueriesDirectly:
         assert isinstance(result, list)
         assert isinstance(pattern_detected, bool)
 
+    def test_select_queries_highest_priority_category_wins(self):
+        """Alert keywords should win even when a lower-priority keyword appears first"""
+        result, pattern_detected = select_queries_directly(
+            question="Which pods respond slowly and have issues?",
+            namespace="test-ns",
+            model_name="test-model",
+            rate_interval="5m",
+            is_fleet_wide=False
+        )
+
+        assert pattern_detected is True
+        assert result == ['ALERTS{alertstate="firing", namespace="test-ns"}']
+
+    def test_select_queries_cached_result_is_not_shared(self):
+        """Mutating a returned list should not leak into later calls for the same question"""
+        first, _ = select_queries_directly("What is the GPU temperature?", "test-ns", "test-model", "5m", False)
+        first.append("mutated")
+
+        second, pattern_detected = select_queries_directly("what is the gpu temperature?", "test-ns", "test-model", "5m", False)
+
+        assert pattern_detected is True
+        assert second == ["avg(DCGM_FI_DEV_GPU_TEMP)"]
+
+    @patch('src.core.promql_service.logger')
+    def test_select_queries_logs_on_cache_hit(self, mock_logger):
+        """A repeated question should log the same as the first time it was asked"""
+        question = "Tell me something about the cluster please"
+
+        select_queries_directly(question, "test-ns", "test-model", "5m", False)
+        select_queries_directly(question, "test-ns", "test-model", "5m", False)
+
+        mock_logger.info.assert_called_with("No specific pattern detected, using intelligent defaults")
+        assert mock_logger.info.call_count == 2
+
 
 class TestGeneratePromQLFromDiscoveredMetric:
     """Test PromQL generation from discovered metrics"""
@@ -0,0 +1,43 @@
+"""
+Tests for the ranked regex helpers in core.regex_utils.
+"""
+
+import re
+
+from src.core.regex_utils import compile_ranked, first_ranked_match
+
+
+class TestFirstRankedMatch:
+    """Test priority-ordered matching with a compile_ranked regex"""
+
+    def test_lowest_rank_wins_regardless_of_position(self):
+        """A higher-priority pattern later in the text should beat an earlier one"""
+        regex = compile_ranked(["error", "warn"])
+
+        rank, match = first_ranked_match(regex, "warn first, then error")
+
+        assert rank == 0
+        assert match.group(match.lastgroup) == "error"
+
+    def test_overlapping_matches_are_seen(self):
+        """A pattern that starts inside another match should still be found"""
+        regex = compile_ranked(["last 24h", "24h ago"])
+
+        rank, _ = first_ranked_match(regex, "24h ago and the last 24h")
+
+        assert rank == 0
+
+    def test_flags_apply_to_every_pattern(self):
+        """Flags passed to compile_ranked should cover all patterns"""
+        regex = compile_ranked(["timeout", "refused"], re.IGNORECASE)
+
+        rank, match = first_ranked_match(regex, "Connection REFUSED")
+
+        assert rank == 1
+        assert match.group(match.lastgroup) == "REFUSED"
+
+    def test_no_match_returns_none(self):
+        """Text without any pattern should return None"""
+        regex = compile_ranked(["error"])
+
+        assert first_ranked_match(regex, "all good") is None
@@ -0,0 +1,192 @@
+"""
+Tests for Tempo query service functionality.
+
+This module tests result caching and wildcard fan-out in the core tempo_service module.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from src.core.tempo_service import TempoQueryService
+from src.mcp_server.tools.tempo_tools import _get_tempo_service
+
+
+START = "2024-01-01T00:00:00Z"
+END = "2024-01-01T01:00:00Z"
+
+
+def _clear_shared_tempo_cache():
+    """Clear the process-wide TempoQueryService's caches, if it was created"""
+    if _get_tempo_service.cache_info().currsize:
+        _get_tempo_service().clear_query_cache()
+
+
+@pytest.fixture(autouse=True)
+def _clear_tempo_cache():
+    """Isolate tests from Tempo results cached by earlier tests"""
+    _clear_shared_tempo_cache()
+    yield
+    _clear_shared_tempo_cache()
+
+
+class TestQueryTracesCache:
+    """Test caching of Tempo query results"""
+
+    def test_identical_queries_reuse_result(self):
+        """Should only hit Tempo once for repeated identical queries"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": [{"traceID": "abc", "spans": []}]})
+
+        first = asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+        second = asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+
+        assert first == second
+        assert first["success"] is True
+        assert service.client.query_traces.await_count == 1
+
+    def test_cached_result_is_isolated_from_callers(self):
+        """Should not let a caller's in-place changes leak into later cache hits"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": [{"traceID": "abc", "spans": []}]})
+
+        first = asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+        first["traces"].append({"traceID": "extra"})
+        second = asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+        second["traces"][0]["traceID"] = "changed"
+        third = asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+
+        assert [trace["traceID"] for trace in third["traces"]] == ["abc"]
+        assert service.client.query_traces.await_count == 1
+
+    def test_sub_second_timestamps_share_entry(self):
+        """Should reuse results for windows that only differ below one second"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": []})
+
+        asyncio.run(service.query_traces("service.name=ui", "2024-01-01T00:00:00.120000Z", END, 10))
+        hit = asyncio.run(service.query_traces("service.name=ui", "2024-01-01T00:00:00.870000Z", END, 10))
+
+        assert service.client.query_traces.await_count == 1
+        assert hit["time_range"] == f"2024-01-01T00:00:00.870000Z to {END}"
+
+    def test_windows_within_one_ttl_share_entry(self):
+        """Should reuse results for "now"-based windows built a few seconds apart"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": []})
+
+        asyncio.run(service.query_traces("service.name=ui", "2024-01-01T00:00:05Z", "2024-01-01T01:00:05Z", 10))
+        asyncio.run(service.query_traces("service.name=ui", "2024-01-01T00:00:12Z", "2024-01-01T01:00:12Z", 10))
+
+        assert service.client.query_traces.await_count == 1
+
+    def test_windows_in_different_ttl_buckets_are_not_reused(self):
+        """Should query Tempo again once the window moves into the next bucket"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": []})
+
+        asyncio.run(service.query_traces("service.name=ui", "2024-01-01T00:00:05Z", "2024-01-01T01:00:05Z", 10))
+        asyncio.run(service.query_traces("service.name=ui", "2024-01-01T00:00:45Z", "2024-01-01T01:00:45Z", 10))
+
+        assert service.client.query_traces.await_count == 2
+
+    def test_different_limit_is_not_reused(self):
+        """Should treat the limit as part of the cache key"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": []})
+
+        asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+        asyncio.run(service.query_traces("service.name=ui", START, END, 20))
+
+        assert service.client.query_traces.await_count == 2
+
+    def test_failed_queries_are_not_cached(self):
+        """Should retry Tempo after a failed query"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(side_effect=Exception("Connection refused"))
+
+        first = asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+        asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+
+        assert first["success"] is False
+        assert service.client.query_traces.await_count == 2
+
+    def test_wildcard_query_with_failed_services_is_not_cached(self):
+        """Should retry Tempo when every service failed during a wildcard query"""
+        service = TempoQueryService()
+        service.client.get_services = AsyncMock(return_value=["ui", "api"])
+        service.client.query_traces = AsyncMock(side_effect=Exception("Connection refused"))
+
+        first = asyncio.run(service.query_traces("service.name=*", START, END, 10))
+        service.client.query_traces = AsyncMock(return_value={"data": [{"traceID": "abc", "spans": []}]})
+        second = asyncio.run(service.query_traces("service.name=*", START, END, 10))
+
+        assert first["failed_services"] == ["ui", "api"]
+        assert second["services_queried"] == ["ui", "api"]
+        assert second["total"] == 2
+
+    @patch("src.core.tempo_service.TEMPO_QUERY_CACHE_TTL_SECONDS", 0)
+    def test_zero_ttl_disables_cache(self):
+        """Should always query Tempo when the TTL is 0"""
+        service = TempoQueryService()
+        service.client.query_traces = AsyncMock(return_value={"data": []})
+
+        asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+        asyncio.run(service.query_traces("service.name=ui", START, END, 10))
+
+        assert service.client.query_traces.await_count == 2
+
+
+class TestAvailableServicesCache:
+    """Test caching of Tempo service discovery"""
+
+    def test_service_list_is_reused(self):
+        """Should only ask Tempo for services once within the TTL"""
+        service = TempoQueryService()
+        service.client.get_services = AsyncMock(return_value=["ui", "api"])
+
+        first = asyncio.run(service.get_available_services())
+        second = asyncio.run(service.get_available_services())
+
+        assert first == second == ["ui", "api"]
+        assert service.client.get_services.await_count == 1
+
+    def test_empty_service_list_is_not_cached(self):
+        """Should retry discovery when Tempo returned no services"""
+        service = TempoQueryService()
+        service.client.get_services = AsyncMock(return_value=[])
+
+        asyncio.run(service.get_available_services())
+        asyncio.run(service.get_available_services())
+
+        assert service.client.get_services.await_count == 2
+
+
+class TestQueryAllServices:
+    """Test wildcard queries across all services"""
+
+    def test_services_are_queried_concurrently_in_order(self):
+        """Should query services in parallel and keep results in service order"""
+        service = TempoQueryService()
+        service.client.get_services = AsyncMock(return_value=["ui", "api", "db"])
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_query(params):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if params["service"] == "api":
+                raise Exception("Connection refused")
+            return {"data": [{"traceID": params["service"], "spans": []}]}
+
+        service.client.query_traces = fake_query
+
+        result = asyncio.run(service.query_traces("service.name=*", START, END, 10))
+
+        assert result["success"] is True
+        assert max_in_flight > 1
+        assert result["services_queried"] == ["ui", "db"]
+        assert result["failed_services"] == ["api"]
@@ -291,6 +291,28 @@ class TestUtilityFunctions:
             result = extract_time_range_from_question(question)
             assert result == expected_range
 
+    def test_convert_time_range_to_iso_uses_utc(self):
+        """Test that converted time ranges are UTC timestamps with a Z suffix."""
+        from datetime import timezone
+        from core.time_utils import convert_time_range_to_iso
+
+        before = datetime.now(timezone.utc)
+        start_iso, end_iso = convert_time_range_to_iso("last 2h")
+        after = datetime.now(timezone.utc)
+
+        assert start_iso.endswith("Z") and end_iso.endswith("Z")
+        start = datetime.fromisoformat(start_iso.replace("Z", "+00:00"))
+        end = datetime.fromisoformat(end_iso.replace("Z", "+00:00"))
+        assert before <= end <= after
+        assert end - start == timedelta(hours=2)
+
+    def test_iso_to_unix_seconds(self):
+        """Test ISO timestamp conversion treats a Z suffix as UTC."""
+        from core.time_utils import iso_to_unix_seconds
+
+        assert iso_to_unix_seconds("1970-01-01T00:01:00Z") == 60
+        assert iso_to_unix_seconds("2024-01-01T00:00:00+01:00") == 1704063600
+
 
 class TestTempoQueryToolClass:
     """Test TempoQueryTool class methods."""
@@ -319,6 +341,12 @@ class TestTempoQueryToolClass:
         assert tool.service is not None
         assert hasattr(tool.service, 'client')
 
+    def test_tempo_query_tool_reuses_service(self):
+        """Test that TempoQueryTool instances share one TempoQueryService."""
+        from src.mcp_server.tools.tempo_tools import TempoQueryTool
+
+        assert TempoQueryTool().service is TempoQueryTool().service
+
     @patch("core.tempo_service.TempoQueryService.get_available_services")
     def test_get_available_services_success(self, mock_get_available_services):
         """Test successful service discovery."""
@@ -343,4 +371,4 @@ class TestTempoQueryToolClass:
         import asyncio
         services = asyncio.run(tool.get_available_services())
         
-        assert services == []
\ No newline at end of file
+        assert services == []